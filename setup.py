@@ -15,13 +15,17 @@ setup(
         'requests==2.34.2',
         'backoff==2.2.1'
     ],
+    extras_require={
+        'async': ['aiohttp==3.14.5'],
+        'fast': ['orjson==3.8.3']
+    },
     entry_points='''
         [console_scripts]
         tap-gitlab=tap_gitlab:main
     ''',
     packages=find_packages(),
     package_data={
-        'tap_gitlab': ['schemas/*.json', 'schemas/shared/*.json']
+        'tap_gitlab': ['catalog.json', 'schemas/*.json', 'schemas/shared/*.json']
     },
     include_package_data=True,
 )
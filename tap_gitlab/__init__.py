@@ -1,9 +1,6 @@
 import sys
 import json
 import singer
-from tap_gitlab.client import Client
-from tap_gitlab.discover import discover
-from tap_gitlab.sync import sync
 
 LOGGER = singer.get_logger()
 
@@ -15,9 +12,10 @@ def do_discover():
     """
     Discover and emit the catalog to stdout
     """
+    from tap_gitlab.discover import load_catalog
+
     LOGGER.info("Starting discover")
-    catalog = discover()
-    json.dump(catalog.to_dict(), sys.stdout, indent=2)
+    json.dump(load_catalog(), sys.stdout, indent=2)
     LOGGER.info("Finished discover")
 
 
@@ -31,10 +29,15 @@ def main():
     if parsed_args.state:
         state = parsed_args.state
 
-    with Client(parsed_args.config) as client:
-        if parsed_args.discover:
-            do_discover()
-        elif parsed_args.catalog:
+    if parsed_args.discover:
+        # Discovery reads the precompiled catalog and makes no requests.
+        do_discover()
+    elif parsed_args.catalog:
+        # Imported on demand so that importing the package and discovery stay cheap.
+        from tap_gitlab.client import Client
+        from tap_gitlab.sync import sync
+
+        with Client(parsed_args.config) as client:
             sync(
                 client=client,
                 config=parsed_args.config,
@@ -0,0 +1,214 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Callable, Dict, Mapping, Optional, Tuple
+
+import backoff
+from singer import metrics
+
+from tap_gitlab.client import (
+    get_next_link,
+    page_records,
+    raise_for_error,
+    record_backoff,
+    response_size,
+    wait_if_retry_after
+)
+from tap_gitlab.exceptions import (
+    InternalServerError,
+    RateLimitError,
+    ServiceUnavailableError,
+    UnprocessableEntityError
+)
+from tap_gitlab.request_stats import endpoint_template
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+RETRY_EXCEPTIONS = (
+    asyncio.TimeoutError,
+    InternalServerError,
+    ServiceUnavailableError,
+    UnprocessableEntityError,
+)
+if aiohttp is not None:
+    RETRY_EXCEPTIONS += (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+
+
+class AsyncResponse:
+    """The parts of `requests.Response` that `raise_for_error` and the exceptions read."""
+
+    def __init__(self, status_code: int, headers: Mapping[str, str], body: bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = body
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+
+class AsyncClient:
+    """
+    asyncio counterpart of Client for GET requests.
+
+    Authentication, error mapping (`raise_for_error`), rate limiting and
+    backoff are shared with the wrapped Client, so a request behaves the same
+    on either engine.
+    """
+
+    def __init__(self, client: Any, max_concurrency: int) -> None:
+        if aiohttp is None:
+            raise ImportError("The asyncio engine requires aiohttp. Install it with `pip install tap-gitlab[async]`.")
+        self.client = client
+        self._session = aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=client.request_timeout),
+            connector=aiohttp.TCPConnector(limit=max_concurrency),
+        )
+
+    @property
+    def request_stats(self):
+        return self.client.request_stats
+
+    async def close(self) -> None:
+        await self._session.close()
+
+    async def get(self, endpoint: str, params: Dict, headers: Dict, path: str = None) -> Any:
+        """Performs a GET request."""
+        data, _ = await self._get(endpoint, params, headers, path)
+        return data
+
+    async def paginate(
+        self,
+        path: Optional[str] = None,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        *,
+        endpoint: Optional[str] = None,
+        headers: Optional[Dict] = None,
+        page_size: int = 100,
+        data_key: Optional[str] = None,
+    ) -> AsyncIterator[Any]:
+        """Yield the records of a paginated collection, following the same headers as `Client.paginate`."""
+        endpoint = endpoint or f"{self.client.base_url}/{(path or '').lstrip('/')}"
+        params = dict(params or {}, per_page=page_size)
+        if params.get("pagination") != "keyset":
+            params.setdefault("page", 1)
+
+        while True:
+            response, response_headers = await self._get(endpoint, params, headers or {}, path)
+            records = page_records(response, data_key)
+            for record in records:
+                yield record
+
+            x_next_page = response_headers.get("X-Next-Page")
+            next_url = get_next_link(response_headers)
+            if x_next_page:
+                params["page"] = int(x_next_page)
+            elif next_url:
+                endpoint, params = next_url, {}
+            elif "page" in params and len(records) >= page_size:
+                params["page"] += 1
+            else:
+                return
+
+    async def _get(self, endpoint: str, params: Dict, headers: Dict, path: str = None) -> Tuple[Any, Mapping]:
+        endpoint = endpoint or f"{self.client.base_url}/{path}"
+        headers, params = self.client.authenticate(dict(headers), dict(params))
+        return await self._make_request("GET", endpoint, headers=headers, params=params)
+
+    @backoff.on_exception(
+        wait_gen=backoff.expo,
+        exception=RETRY_EXCEPTIONS,
+        max_tries=5,
+        factor=2,
+        on_backoff=record_backoff,
+    )
+    @backoff.on_exception(
+        backoff.runtime,
+        exception=(
+            RateLimitError,
+        ),
+        max_tries=5,
+        value=wait_if_retry_after,
+        jitter=None,
+        on_backoff=record_backoff,
+    )
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Tuple[Any, Mapping]:
+        """Performs the HTTP request with the same rate limiting and error handling as Client."""
+        await asyncio.sleep(self.client.rate_limiter.reserve())
+        with metrics.http_request_timer(endpoint_template(endpoint)) as timer:
+            async with self._session.request(method, endpoint, **kwargs) as raw_response:
+                response = AsyncResponse(raw_response.status, raw_response.headers, await raw_response.read())
+            self.request_stats.record_request(
+                endpoint, timer.elapsed(), response.status_code, response_size(response)
+            )
+            self.client.rate_limiter.update(response.headers)
+            if self.client.rate_limiter.tokens is not None:
+                timer.tags["rate_limit_remaining"] = self.client.rate_limiter.tokens
+            raise_for_error(response)
+
+        return response.json(), response.headers
+
+
+class AsyncEngine:
+    """
+    Runs stream syncs as asyncio tasks on an event loop in a background thread.
+
+    `submit` mirrors `Executor.submit` and returns a `concurrent.futures.Future`,
+    so callers on the main thread wait for tasks the same way as for the thread
+    pool. At most `max_concurrency` tasks run at once.
+    """
+
+    # Tells `sync_children` to submit coroutine functions rather than plain callables.
+    runs_coroutines = True
+
+    def __init__(self, client: Any, max_concurrency: int) -> None:
+        self.client = client
+        self.max_concurrency = max_concurrency
+        self.loop = asyncio.new_event_loop()
+        self.async_client = None
+        self._semaphore = None
+        self._futures = []
+        self._thread = threading.Thread(target=self.loop.run_forever, name="gitlab-asyncio", daemon=True)
+
+    def __enter__(self) -> "AsyncEngine":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(), self.loop).result()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback) -> None:
+        if exception_type is not None:
+            for future in self._futures:
+                future.cancel()
+        for future in self._futures:
+            try:
+                future.result()
+            except BaseException:  # pylint: disable=broad-except
+                pass
+        asyncio.run_coroutine_threadsafe(self.async_client.close(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+    async def _open(self) -> None:
+        self.async_client = AsyncClient(self.client, self.max_concurrency)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    def submit(self, coroutine_function: Callable, **kwargs) -> Future:
+        """Schedule `coroutine_function(async_client=..., **kwargs)` as a task on the engine's loop."""
+        future = asyncio.run_coroutine_threadsafe(
+            self._run_limited(coroutine_function, kwargs), self.loop
+        )
+        self._futures.append(future)
+        return future
+
+    async def _run_limited(self, coroutine_function: Callable, kwargs: Dict) -> Any:
+        async with self._semaphore:
+            return await coroutine_function(async_client=self.async_client, **kwargs)
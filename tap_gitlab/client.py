@@ -1,12 +1,28 @@
-from typing import Any, Dict, Mapping, Optional, Tuple
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+import json
 import re
+import socket
+import threading
 
 import backoff
 import requests
 from requests import session
+from requests.adapters import HTTPAdapter
+from requests.utils import parse_header_links
 from requests.exceptions import Timeout, ConnectionError, ChunkedEncodingError
 from singer import get_logger, metrics
-
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+from tap_gitlab.credentials_cache import DEFAULT_TTL_SECONDS, CredentialsCache, credentials_key
+from tap_gitlab.etag_cache import DEFAULT_MAX_BYTES, ETagCache
+from tap_gitlab.json_stream import CHUNK_SIZE, decode_chunks, iter_json_array
+from tap_gitlab.output import Checkpointer
+from tap_gitlab.rate_limiter import RateLimiter
+from tap_gitlab.request_stats import RequestStats, endpoint_template
 from tap_gitlab.exceptions import (
     ERROR_CODE_EXCEPTION_MAPPING,
     Error,
@@ -18,6 +34,9 @@ from tap_gitlab.exceptions import (
 
 LOGGER = get_logger()
 REQUEST_TIMEOUT = 300
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_CONCURRENCY = 50
+DEFAULT_ACCEPT_ENCODING = "gzip, deflate"
 
 
 def wait_if_retry_after(exception_info):
@@ -48,14 +67,52 @@ def wait_if_retry_after(exception_info):
         return 60
 
 
+def get_next_link(headers: Mapping[str, str]) -> Optional[str]:
+    """Return the `rel="next"` URL of a `Link` response header, if any."""
+    link_header = headers.get('link') or headers.get('Link')
+    if not link_header:
+        return None
+    for link in parse_header_links(link_header):
+        if link.get("rel") == "next":
+            return link.get("url")
+    return None
+
+
+def record_backoff(details: Dict) -> None:
+    """backoff handler counting a retry and its wait against the request's endpoint."""
+    client, _method, endpoint = details["args"][:3]
+    client.request_stats.record_backoff(endpoint, details.get("wait"))
+
+
+def response_size(response: requests.Response, streamed: bool = False) -> int:
+    """Size of a response body, as sent on the wire when GitLab reports it."""
+    content_length = response.headers.get("Content-Length") if response.headers else None
+    if content_length and content_length.isdigit():
+        return int(content_length)
+    if streamed:
+        # Counted while the body is consumed.
+        return 0
+    return len(getattr(response, "content", b"") or b"")
+
+
+def page_records(response: Any, data_key: Optional[str] = None) -> list:
+    """The records of one page; a response that is not a list counts as a single record."""
+    if isinstance(response, dict) and data_key:
+        return response.get(data_key, [])
+    if isinstance(response, list):
+        return response
+    return [response]
+
+
 def raise_for_error(response: requests.Response) -> None:
     """Raises the associated response exception based on status code."""
-    try:
-        response_json = response.json()
-    except Exception:
-        response_json = {}
-
     if response.status_code not in [200, 201, 204]:
+        # Only error bodies are decoded here; successful streamed bodies are left for the caller.
+        try:
+            response_json = response.json()
+        except Exception:
+            response_json = {}
+
         if response_json.get("error"):
             message = f"HTTP-error-code: {response.status_code}, Error: {response_json.get('error')}"
             if response_json.get("error_description"):
@@ -73,6 +130,21 @@ def raise_for_error(response: requests.Response) -> None:
         raise exc(message, response) from None
 
 
+class KeepAliveHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that can enable TCP keep-alive on pooled connections."""
+
+    def __init__(self, tcp_keepalive: bool = True, **kwargs) -> None:
+        self.tcp_keepalive = tcp_keepalive
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        if self.tcp_keepalive:
+            kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+                (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            ]
+        super().init_poolmanager(*args, **kwargs)
+
+
 class Client:
     """
     A Wrapper class for API calls.
@@ -84,7 +156,6 @@ class Client:
 
     def __init__(self, config: Mapping[str, Any]) -> None:
         self.config = config
-        self._session = session()
 
         api_url = (config.get("api_url") or "").strip() or "https://gitlab.com"
         api_url = api_url.rstrip("/")
@@ -98,13 +169,116 @@ class Client:
         config_request_timeout = config.get("request_timeout")
         self.request_timeout = float(config_request_timeout) if config_request_timeout else REQUEST_TIMEOUT
 
+        # Number of threads used to sync child streams of a parent record concurrently.
+        self.max_workers = max(int(config.get("max_workers") or 1), 1)
+        # "threads" runs child syncs on a thread pool; "asyncio" runs them as tasks on an event loop.
+        self.engine = (config.get("engine") or "threads").lower()
+        self.max_concurrency = max(int(config.get("max_concurrency") or DEFAULT_MAX_CONCURRENCY), 1)
+        # Number of offset pages fetched concurrently when the total page count is known.
+        self.prefetch_pages = max(int(config.get("prefetch_pages") or 1), 1)
+        # Decode list pages incrementally instead of loading each body at once.
+        self.stream_json = str(config.get("stream_json", "")).lower() in ("true", "1")
+
+        self._session = self.__build_session()
+
+        # Conditional-request cache for per-entity GETs; disabled unless a path is configured.
+        self.etag_cache = None
+        if config.get("etag_cache_path"):
+            max_bytes = int(float(config.get("etag_cache_max_mb") or 0) * 1024 * 1024) or DEFAULT_MAX_BYTES
+            self.etag_cache = ETagCache(config["etag_cache_path"], max_bytes)
+
+        # Recent successful credential checks; disabled unless a path is configured.
+        self.credentials_cache = None
+        if config.get("credentials_cache_path"):
+            ttl_seconds = float(config.get("credentials_cache_ttl") or DEFAULT_TTL_SECONDS)
+            self.credentials_cache = CredentialsCache(config["credentials_cache_path"], ttl_seconds)
+
+        # Paces requests from the RateLimit-* headers so the API does not have to answer with 429.
+        self.rate_limiter = RateLimiter(reserve=int(config.get("rate_limit_reserve") or 1))
+
+        # Mid-stream STATE every N records or T seconds; off unless configured.
+        self.checkpointer = Checkpointer(
+            every_records=int(config.get("checkpoint_records") or 0),
+            every_seconds=float(config.get("checkpoint_seconds") or 0),
+        )
+
+        # Per-endpoint latency, bytes, retries and 429s, summarised at the end of the run.
+        self.request_stats = RequestStats()
+
+        # Response headers are tracked per thread so concurrent child syncs
+        # read the pagination headers of their own requests.
+        self._local = threading.local()
+
+    def __build_session(self) -> requests.Session:
+        """Create the HTTP session with a connection pool sized for the configured concurrency."""
+        config = self.config
+        http_session = session()
+
+        # Every worker and prefetch thread may hold a connection at the same time.
+        pool_maxsize = int(config.get("pool_maxsize") or max(DEFAULT_POOL_SIZE, self.max_workers * self.prefetch_pages))
+        pool_connections = int(config.get("pool_connections") or DEFAULT_POOL_SIZE)
+        # Transport-level retries for failed connects and reads; HTTP status retries stay with backoff.
+        connect_retries = int(config.get("connect_retries") or 0)
+        read_retries = int(config.get("read_retries") or 0)
+        max_retries = Retry(
+            total=connect_retries + read_retries,
+            connect=connect_retries,
+            # False keeps requests' default: read timeouts surface as ReadTimeout, not ConnectionError.
+            read=read_retries or False,
+            status=0,
+            other=0,
+            backoff_factor=0.5,
+            raise_on_status=False,
+        )
+        adapter = KeepAliveHTTPAdapter(
+            tcp_keepalive=str(config.get("tcp_keepalive", "true")).lower() in ("true", "1"),
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+        )
+        http_session.mount("https://", adapter)
+        http_session.mount("http://", adapter)
+
+        http_session.headers["Accept-Encoding"] = config.get("accept_encoding") or DEFAULT_ACCEPT_ENCODING
+        http_session.headers["Connection"] = "keep-alive"
+        return http_session
+
     def __enter__(self):
-        self.check_api_credentials()
+        self.verify_credentials()
         return self
 
     def __exit__(self, exception_type, exception_value, traceback):
+        if self.rate_limiter.throttled_seconds:
+            LOGGER.info(
+                f"Rate limiter paced requests for {self.rate_limiter.throttled_seconds:.1f} seconds in total. "
+                f"Remaining budget: {self.rate_limiter.tokens}/{self.rate_limiter.limit}"
+            )
+        if self.etag_cache:
+            self.etag_cache.close()
         self._session.close()
 
+    @property
+    def last_response_headers(self) -> Mapping[str, str]:
+        """Headers of the last response received on the calling thread."""
+        return getattr(self._local, "response_headers", {})
+
+    @last_response_headers.setter
+    def last_response_headers(self, headers: Mapping[str, str]) -> None:
+        self._local.response_headers = headers
+
+    def verify_credentials(self) -> None:
+        """Check the API credentials, unless the credentials cache holds a recent successful check."""
+        if self.credentials_cache is None:
+            self.check_api_credentials()
+            return
+
+        key = credentials_key(self.base_url, self.config.get("private_token") or "")
+        if self.credentials_cache.is_verified(key):
+            LOGGER.info("Credentials were verified recently, skipping the check.")
+            return
+        self.check_api_credentials()
+        self.credentials_cache.record(key)
+
     def check_api_credentials(self) -> None:
         """Verify API credentials by making a test request."""
         headers, params = self.authenticate({}, {})
@@ -147,6 +321,32 @@ class Client:
         headers, params = self.authenticate(headers, params)
         return self.__make_request("GET", endpoint, headers=headers, params=params, timeout=self.request_timeout)
 
+    def get_cached(self, endpoint: str, params: Dict, headers: Dict, path: str = None) -> Any:
+        """
+        Performs a conditional GET. The ETag of the last response for the URL is
+        sent as If-None-Match and a 304 is answered from the ETag cache.
+        """
+        if self.etag_cache is None:
+            return self.get(endpoint, params, headers, path)
+
+        endpoint = endpoint or f"{self.base_url}/{path}"
+        headers, params = self.authenticate(headers, params)
+        cache_key = requests.Request("GET", endpoint, params=params).prepare().url
+        cached = self.etag_cache.get(cache_key)
+        if cached:
+            headers = dict(headers, **{"If-None-Match": cached[0]})
+        return self.__make_request(
+            "GET", endpoint, headers=headers, params=params, timeout=self.request_timeout, cache_key=cache_key
+        )
+
+    def get_iter(self, endpoint: str, params: Dict, headers: Dict, path: str = None) -> Iterator[Any]:
+        """Performs a GET request and decodes the JSON array in the body one element at a time."""
+        endpoint = endpoint or f"{self.base_url}/{path}"
+        headers, params = self.authenticate(headers, params)
+        return self.__make_request(
+            "GET", endpoint, headers=headers, params=params, timeout=self.request_timeout, stream=True
+        )
+
     def post(self, endpoint: str, params: Dict, headers: Dict, body: Dict, path: str = None) -> Any:
         """Performs a POST request."""
         endpoint = endpoint or f"{self.base_url}/{path}"
@@ -166,6 +366,7 @@ class Client:
         ),
         max_tries=5,
         factor=2,
+        on_backoff=record_backoff,
     )
     @backoff.on_exception(
         backoff.runtime,
@@ -174,44 +375,155 @@ class Client:
         ),
         max_tries=5,
         value=wait_if_retry_after,
-        jitter=None
+        jitter=None,
+        on_backoff=record_backoff,
     )
     def __make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Mapping[Any, Any]]:
         """Performs the actual HTTP request with backoff and error handling."""
-        with metrics.http_request_timer(endpoint) as timer:
+        cache_key = kwargs.pop("cache_key", None)
+        self.rate_limiter.acquire()
+        with metrics.http_request_timer(endpoint_template(endpoint)) as timer:
             response = self._session.request(method, endpoint, **kwargs)
-            raise_for_error(response)
+            self.request_stats.record_request(
+                endpoint, timer.elapsed(), response.status_code, response_size(response, kwargs.get("stream"))
+            )
+            self.rate_limiter.update(response.headers or {})
+            if self.rate_limiter.tokens is not None:
+                timer.tags["rate_limit_remaining"] = self.rate_limiter.tokens
 
             # Store response headers for pagination
             self.last_response_headers = response.headers
 
-        return response.json()
+            if cache_key and response.status_code == 304:
+                cached = self.etag_cache.get(cache_key)
+                if cached:
+                    timer.tags["cache"] = "hit"
+                    self.etag_cache.hits += 1
+                    return json.loads(cached[1])
+                # The entry was evicted since the request was sent; fetch the body unconditionally.
+                kwargs["headers"] = {k: v for k, v in kwargs["headers"].items() if k != "If-None-Match"}
+                response = self._session.request(method, endpoint, **kwargs)
+                self.last_response_headers = response.headers
 
-    def paginate(self, path: str, params: Optional[Dict] = None, context: Optional[Dict] = None) -> list:
-        """Handles paginated GET requests."""
-        results = []
-        params = params or {}
-        headers = {}
-        next_page = 1
+            raise_for_error(response)
 
-        while True:
-            params["page"] = next_page
-            full_url = f"{self.base_url}{path}"
+        if cache_key:
+            self.etag_cache.misses += 1
+            etag = response.headers.get("ETag")
+            if etag:
+                self.etag_cache.put(cache_key, etag, response.text)
 
-            # Perform authenticated GET request
-            headers, _ = self.authenticate(headers, params)
+        if kwargs.get("stream"):
+            return self.__iter_response(endpoint, response)
+        return response.json()
 
-            response = self._session.get(full_url, headers=headers, params=params, timeout=self.request_timeout)
-            raise_for_error(response)
-            data = response.json()
-            if isinstance(data, list):
-                results.extend(data)
-            else:
-                results.append(data)
+    def __iter_response(self, endpoint: str, response: requests.Response) -> Iterator[Any]:
+        """Yield the decoded elements of a streamed response, releasing the connection afterwards."""
+        received = 0
 
-            next_page = response.headers.get("X-Next-Page")
-            if not next_page:
-                break
-            next_page = int(next_page)
+        def counted_chunks() -> Iterator[bytes]:
+            nonlocal received
+            for chunk in response.iter_content(CHUNK_SIZE):
+                received += len(chunk)
+                yield chunk
 
-        return results
+        try:
+            yield from iter_json_array(decode_chunks(counted_chunks()))
+        finally:
+            response.close()
+            if not response.headers.get("Content-Length"):
+                self.request_stats.record_bytes(endpoint, received)
+
+    def paginate(
+        self,
+        path: Optional[str] = None,
+        params: Optional[Dict] = None,
+        context: Optional[Dict] = None,
+        *,
+        endpoint: Optional[str] = None,
+        headers: Optional[Dict] = None,
+        page_size: int = 100,
+        data_key: Optional[str] = None,
+    ) -> Iterator[Any]:
+        """
+        Yield the records of a paginated collection one page at a time.
+
+        `path` is relative to the API root; `endpoint` is a full URL and takes
+        precedence. A response that is not a list is yielded as one record.
+
+        Every page is requested through `get` (or `get_iter` when `stream_json`
+        is enabled), so it shares the retry, rate limit and timing path of a
+        single request. Offset pages advance with `X-Next-Page`; keyset pages
+        follow the `Link: rel="next"` header. When `prefetch_pages` is set and
+        the first page reports `X-Total-Pages`, the remaining offset pages are
+        fetched concurrently and still yielded in order.
+        """
+        endpoint = endpoint or f"{self.base_url}/{(path or '').lstrip('/')}"
+        params = dict(params or {}, per_page=page_size)
+        headers = headers if headers is not None else {}
+        if params.get("pagination") != "keyset":
+            params.setdefault("page", 1)
+
+        while True:
+            # The next page is worked out before any record is yielded: the caller may
+            # sync child streams in between, and their requests replace `last_response_headers`.
+            records, response_headers = self.__get_page(endpoint, params, headers, data_key)
+            x_next_page = response_headers.get('x-next-page') or response_headers.get('X-Next-Page')
+            total_pages = response_headers.get('x-total-pages') or response_headers.get('X-Total-Pages')
+            next_url = get_next_link(response_headers)
+            prefetch = params.get("page") == 1 and x_next_page and total_pages and self.prefetch_pages > 1
+
+            record_count = 0
+            for record in records:
+                record_count += 1
+                yield record
+
+            if prefetch:
+                yield from self.__get_prefetched_pages(
+                    endpoint, params, headers, data_key, range(2, int(total_pages) + 1)
+                )
+                return
+
+            if x_next_page:
+                params["page"] = int(x_next_page)
+            elif next_url:
+                # The next link already carries every query parameter, including the cursor.
+                endpoint, params = next_url, {}
+            elif "page" in params and record_count >= page_size:
+                # Large collections omit the pagination headers; keep going until a short page.
+                params["page"] += 1
+            else:
+                return
+
+    def __get_page(
+        self, endpoint: str, params: Dict, headers: Dict, data_key: Optional[str]
+    ) -> Tuple[Iterable, Mapping[str, str]]:
+        """Request one page and return the records it contains with the headers of its response."""
+        if self.stream_json and not data_key:
+            records = self.get_iter(endpoint, dict(params), headers)
+        else:
+            records = page_records(self.get(endpoint, dict(params), headers), data_key)
+        return records, self.last_response_headers
+
+    def __get_prefetched_pages(
+        self, endpoint: str, params: Dict, headers: Dict, data_key: Optional[str], pages: range
+    ) -> Iterator[Any]:
+        """Fetch offset pages on a bounded thread pool and yield their records in page order."""
+        def fetch_page(page: int) -> list:
+            return page_records(self.get(endpoint, dict(params, page=page), dict(headers)), data_key)
+
+        executor = ThreadPoolExecutor(max_workers=self.prefetch_pages, thread_name_prefix="gitlab-pages")
+        pending = deque()
+        page_iter = iter(pages)
+        try:
+            for page in page_iter:
+                pending.append(executor.submit(copy_context().run, fetch_page, page))
+                if len(pending) == self.prefetch_pages:
+                    break
+            while pending:
+                yield from pending.popleft().result()
+                for page in page_iter:
+                    pending.append(executor.submit(copy_context().run, fetch_page, page))
+                    break
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
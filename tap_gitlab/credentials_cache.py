@@ -0,0 +1,59 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+DEFAULT_TTL_SECONDS = 300
+
+
+def credentials_key(base_url: str, private_token: str) -> str:
+    """Identify a (GitLab host, token) pair without storing the token itself."""
+    return hashlib.sha256(f"{base_url}\n{private_token}".encode("utf-8")).hexdigest()
+
+
+class CredentialsCache:
+    """
+    Small JSON file recording which credentials passed the `GET /user` check,
+    and until when that result is trusted. Only SHA-256 digests of the host
+    and token are written, never the token.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+
+    def _read(self) -> Dict[str, float]:
+        try:
+            with open(self.path) as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def is_verified(self, key: str) -> bool:
+        """Whether the credentials passed a check less than `ttl_seconds` ago."""
+        expires_at = self._read().get(key)
+        return isinstance(expires_at, (int, float)) and expires_at > time.time()
+
+    def record(self, key: str) -> None:
+        """Record a successful check. Failing to write the file only costs a check on the next run."""
+        now = time.time()
+        entries = {
+            other: expires_at for other, expires_at in self._read().items()
+            if isinstance(expires_at, (int, float)) and expires_at > now
+        }
+        entries[key] = now + self.ttl_seconds
+
+        temporary_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "w") as file:
+                json.dump(entries, file)
+            os.replace(temporary_path, self.path)
+        except OSError as err:
+            LOGGER.warning(f"Unable to write the credentials cache at '{self.path}': {err}")
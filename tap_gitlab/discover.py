@@ -1,14 +1,20 @@
+import os
+import json
+from typing import Dict
 import singer
 from singer import metadata
 from singer.catalog import Catalog, CatalogEntry, Schema
-from tap_gitlab.schema import get_schemas
+from tap_gitlab.schema import get_abs_path, get_schemas
 
 LOGGER = singer.get_logger()
 
+# Catalog precompiled from the schema files, with references resolved and metadata generated.
+CATALOG_PATH = get_abs_path("catalog.json")
 
-def discover() -> Catalog:
+
+def build_catalog() -> Catalog:
     """
-    Run the discovery mode, prepare the catalog file and return the catalog.
+    Build the catalog from the schema files and the stream classes.
     """
     schemas, field_metadata = get_schemas()
     catalog = Catalog([])
@@ -36,3 +42,36 @@ def discover() -> Catalog:
         )
 
     return catalog
+
+
+def write_catalog(path: str = CATALOG_PATH) -> None:
+    """
+    Precompile the catalog to `path`. Run `python -m tap_gitlab.discover`
+    after changing a schema file or a stream's keys.
+    """
+    with open(path, "w") as file:
+        json.dump(build_catalog().to_dict(), file, indent=2)
+        file.write("\n")
+
+
+def load_catalog() -> Dict:
+    """
+    Return the catalog as a dict, read from the precompiled file when it exists.
+    """
+    if os.path.exists(CATALOG_PATH):
+        with open(CATALOG_PATH) as file:
+            return json.load(file)
+
+    LOGGER.warning("Precompiled catalog not found, building it from the schema files.")
+    return build_catalog().to_dict()
+
+
+def discover() -> Catalog:
+    """
+    Run the discovery mode, prepare the catalog file and return the catalog.
+    """
+    return Catalog.from_dict(load_catalog())
+
+
+if __name__ == "__main__":
+    write_catalog()
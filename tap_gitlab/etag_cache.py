@@ -0,0 +1,86 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+
+class ETagCache:
+    """
+    On-disk store of response bodies keyed by request URL, used for
+    conditional GETs. Entries hold the ETag and body of the last 200
+    response; the least recently used entries are evicted once the stored
+    bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " url TEXT PRIMARY KEY,"
+            " etag TEXT NOT NULL,"
+            " body TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)")
+        self._connection.commit()
+        self._total_bytes = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def get(self, url: str) -> Optional[Tuple[str, str]]:
+        """Return the cached (etag, body) for a URL, if any."""
+        with self._lock:
+            row = self._connection.execute("SELECT etag, body FROM entries WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            self._connection.execute("UPDATE entries SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._connection.commit()
+            return row[0], row[1]
+
+    def put(self, url: str, etag: str, body: str) -> None:
+        """Store the ETag and body of a response, evicting old entries past the size cap."""
+        size = len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._connection.execute("SELECT size FROM entries WHERE url = ?", (url,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO entries (url, etag, body, size, last_used) VALUES (?, ?, ?, ?, ?)",
+                (url, etag, body, size, time.time()),
+            )
+            self._total_bytes += size - (previous[0] if previous else 0)
+            self._evict()
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits in `max_bytes`."""
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        rows = self._connection.execute("SELECT url, size FROM entries ORDER BY last_used ASC").fetchall()
+        for url, size in rows:
+            if self._total_bytes <= self.max_bytes:
+                break
+            self._connection.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self._total_bytes -= size
+
+    def close(self) -> None:
+        if self.hits or self.misses:
+            LOGGER.info(f"ETag cache: {self.hits} responses served from cache, {self.misses} refreshed")
+        with self._lock:
+            self._connection.close()
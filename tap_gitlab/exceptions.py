@@ -28,6 +28,10 @@ class NotFoundError(Error):
     """class representing 404 status code."""
     pass
 
+class MethodNotAllowedError(Error):
+    """class representing 405 status code."""
+    pass
+
 class ConflictError(Error):
     """class representing 409 status code."""
     pass
@@ -115,6 +119,10 @@ ERROR_CODE_EXCEPTION_MAPPING = {
         "raise_exception": NotFoundError,
         "message": "The resource you have specified cannot be found."
     },
+    405: {
+        "raise_exception": MethodNotAllowedError,
+        "message": "The requested method or pagination mode is not supported by this endpoint."
+    },
     409: {
         "raise_exception": ConflictError,
         "message": "The API request cannot be completed because the requested operation would conflict with an existing item."
@@ -0,0 +1,79 @@
+import codecs
+import json
+from typing import Any, Iterable, Iterator
+
+CHUNK_SIZE = 64 * 1024
+WHITESPACE = " \t\n\r"
+
+
+def decode_chunks(byte_chunks: Iterable[bytes], encoding: str = "utf-8") -> Iterator[str]:
+    """Decode a stream of byte chunks without splitting multi-byte characters."""
+    decoder = codecs.getincrementaldecoder(encoding)()
+    for chunk in byte_chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array as the text arrives.
+
+    Only the unconsumed part of the body is buffered, so memory stays close
+    to the size of the largest element. A document that is not an array is
+    decoded whole and yielded as a single value.
+    """
+    decoder = json.JSONDecoder()
+    chunk_iter = iter(chunks)
+    buffer, position = "", 0
+    exhausted = False
+    in_array = False
+
+    def read_more() -> bool:
+        nonlocal buffer, position, exhausted
+        for chunk in chunk_iter:
+            buffer, position = buffer[position:] + chunk, 0
+            return True
+        exhausted = True
+        return False
+
+    while True:
+        while position < len(buffer) and buffer[position] in WHITESPACE:
+            position += 1
+        if position == len(buffer):
+            if read_more():
+                continue
+            if in_array:
+                raise ValueError("Unterminated JSON array in response body")
+            return
+
+        char = buffer[position]
+        if not in_array:
+            if char != "[":
+                yield json.loads(buffer[position:] + "".join(chunk_iter))
+                return
+            in_array = True
+            position += 1
+            continue
+        if char == "]":
+            return
+        if char == ",":
+            position += 1
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if exhausted or not read_more():
+                raise
+            continue
+
+        # A number at the end of the buffer may continue in the next chunk.
+        if end == len(buffer) and not exhausted and read_more():
+            continue
+
+        position = end
+        yield value
@@ -0,0 +1,126 @@
+import math
+import sys
+import threading
+import time
+from typing import Any, Dict, List
+
+import simplejson
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Guards stdout and the shared state dict. Child streams may run on worker
+# threads, so every Singer message goes through this lock to keep each line
+# intact and STATE consistent with the bookmarks it describes.
+LOCK = threading.RLock()
+
+# Encoded messages are collected and written to stdout in blocks of about
+# this size, and whenever STATE is written, so a STATE message never
+# reaches the target before the records it covers.
+BUFFER_SIZE = 1024 * 1024
+
+_buffer: List[bytes] = []
+_buffered_bytes = 0
+
+
+def _has_non_finite(value: Any) -> bool:
+    """Whether a decoded JSON value contains NaN or an infinity."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        return any(_has_non_finite(item) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(item) for item in value)
+    return False
+
+
+def encode_message(message: Dict[str, Any]) -> bytes:
+    """Encode a message as one line of JSON, with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            line = orjson.dumps(message, option=orjson.OPT_APPEND_NEWLINE)  # pylint: disable=no-member
+        except TypeError:
+            # Decimals and other values only simplejson can encode exactly.
+            pass
+        else:
+            # orjson writes NaN and Infinity as null, so lines with a null are checked
+            # and non-finite values are left to simplejson to refuse.
+            if b"null" not in line or not _has_non_finite(message):
+                return line
+    # Like singer's `format_message`, NaN and Infinity are refused rather than written as invalid JSON.
+    return (simplejson.dumps(message, use_decimal=True, allow_nan=False) + "\n").encode("utf-8")
+
+
+def _write(message: Dict[str, Any]) -> None:
+    global _buffered_bytes  # pylint: disable=global-statement
+    line = encode_message(message)
+    with LOCK:
+        _buffer.append(line)
+        _buffered_bytes += len(line)
+        if _buffered_bytes >= BUFFER_SIZE:
+            flush()
+
+
+def flush() -> None:
+    """Write buffered messages to stdout."""
+    global _buffered_bytes  # pylint: disable=global-statement
+    with LOCK:
+        if _buffer:
+            stdout = getattr(sys.stdout, "buffer", None)
+            if stdout is not None:
+                sys.stdout.flush()
+                stdout.write(b"".join(_buffer))
+            else:
+                sys.stdout.write(b"".join(_buffer).decode("utf-8"))
+            _buffer.clear()
+            _buffered_bytes = 0
+        sys.stdout.flush()
+
+
+def write_record(stream_name: str, record: Dict) -> None:
+    """Write a RECORD message."""
+    _write({"type": "RECORD", "stream": stream_name, "record": record})
+
+
+def write_schema(stream_name: str, schema: Dict, key_properties: List[str]) -> None:
+    """Write a SCHEMA message."""
+    _write({"type": "SCHEMA", "stream": stream_name, "schema": schema, "key_properties": key_properties})
+
+
+def write_state(state: Dict[str, Any]) -> None:
+    """Write a STATE message, flushing it and every message before it to stdout."""
+    with LOCK:
+        _write({"type": "STATE", "value": state})
+        flush()
+
+
+class Checkpointer:
+    """
+    Decides when to emit STATE in the middle of a stream: after every
+    `every_records` records or `every_seconds` seconds, whichever comes
+    first. A value of 0 turns that trigger off.
+    """
+
+    def __init__(self, every_records: int = 0, every_seconds: float = 0.0) -> None:
+        self.every_records = every_records
+        self.every_seconds = every_seconds
+        self._records = 0
+        self._last_write = time.monotonic()
+        self._lock = threading.Lock()
+
+    def due(self) -> bool:
+        """Count a record and report whether a checkpoint should be written now."""
+        if not (self.every_records or self.every_seconds):
+            return False
+
+        with self._lock:
+            self._records += 1
+            now = time.monotonic()
+            if (self.every_records and self._records >= self.every_records) or \
+                    (self.every_seconds and now - self._last_write >= self.every_seconds):
+                self._records = 0
+                self._last_write = now
+                return True
+            return False
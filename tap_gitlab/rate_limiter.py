@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Mapping, Optional
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+# Below this share of the limit, remaining requests are spread evenly until the reset.
+PACING_THRESHOLD = 0.1
+
+
+def _header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name.lower()) or headers.get(name)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Client-side token bucket fed by GitLab's RateLimit-* response headers.
+
+    Every response refills the bucket with `RateLimit-Remaining` tokens that
+    are valid until `RateLimit-Reset`. Each request takes a token. When the
+    bucket runs low, requests are paced across the time left in the window,
+    and when it is empty they wait for the reset, so the API never has to
+    answer with a 429.
+    """
+
+    def __init__(self, reserve: int = 1) -> None:
+        self.reserve_tokens = reserve
+        self.limit = None
+        self.tokens = None
+        self.reset_at = None
+        self.throttled_seconds = 0.0
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Refill the bucket from the rate limit headers of a response."""
+        remaining = _header_int(headers, "RateLimit-Remaining")
+        if remaining is None:
+            return
+
+        limit = _header_int(headers, "RateLimit-Limit")
+        reset = _header_int(headers, "RateLimit-Reset")
+        with self._lock:
+            self.tokens = remaining
+            self.limit = limit or self.limit
+            if reset is not None:
+                # GitLab sends an epoch timestamp; accept a delta in seconds as well.
+                self.reset_at = reset if reset > 1e9 else time.time() + reset
+
+    def reserve(self) -> float:
+        """
+        Take a token and return how many seconds the caller must wait before using it.
+
+        Reservations are handed out as consecutive slots, so concurrent callers
+        are spaced out rather than all waking at once.
+        """
+        with self._lock:
+            if self.tokens is None:
+                return 0.0
+
+            now = time.time()
+            start = max(now, self._next_slot)
+            if self.reset_at is not None and start >= self.reset_at:
+                # The window rolled over; the next response will report the real budget.
+                self.tokens = self.limit
+                self.reset_at = None
+
+            ready_at = start
+            if self.reset_at is not None and self.tokens is not None:
+                available = self.tokens - self.reserve_tokens
+                if available <= 0:
+                    ready_at = self.reset_at
+                    self.tokens = self.limit
+                    self.reset_at = None
+                elif self.limit and self.tokens < self.limit * PACING_THRESHOLD:
+                    ready_at = start + (self.reset_at - start) / available
+
+            self._next_slot = ready_at
+            if self.tokens is not None:
+                self.tokens -= 1
+
+            wait = max(ready_at - now, 0.0)
+            if wait > 0:
+                self.throttled_seconds += wait
+                LOGGER.info(
+                    f"Rate limit budget low ({self.tokens}/{self.limit} remaining). "
+                    f"Waiting {wait:.2f} seconds."
+                )
+            return wait
+
+    def acquire(self) -> float:
+        """Take a token, sleeping first if the budget is low. Returns the seconds slept."""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,117 @@
+import bisect
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from singer import get_logger
+
+LOGGER = get_logger()
+
+# Upper bounds (seconds) of the latency histogram buckets; the last bucket is open-ended.
+LATENCY_BUCKETS = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PERCENTILES = (50, 90, 99)
+
+# Path segments that are followed by an identifier in GitLab API URLs.
+ID_SEGMENTS = {"projects", "groups", "users", "milestones", "issues", "commits", "branches"}
+API_PREFIX = re.compile(r"^/api/v\d+/")
+
+# The stream on whose behalf requests are made; a ContextVar so it follows threads and asyncio tasks.
+CURRENT_STREAM: ContextVar[Optional[str]] = ContextVar("current_stream", default=None)
+
+
+def endpoint_template(url: str) -> str:
+    """Reduce a request URL to its endpoint template, e.g. `projects/{id}/issues`."""
+    path = API_PREFIX.sub("", urlparse(url).path)
+    segments = path.strip("/").split("/")
+    template = []
+    for index, segment in enumerate(segments):
+        if index and segments[index - 1] in ID_SEGMENTS:
+            template.append("{id}")
+        elif segment.isdigit():
+            template.append("{id}")
+        else:
+            template.append(segment)
+    return "/".join(template)
+
+
+@contextmanager
+def stream_context(stream_name: str) -> Iterator[None]:
+    """Attribute requests made inside the block to `stream_name`."""
+    token = CURRENT_STREAM.set(stream_name)
+    try:
+        yield
+    finally:
+        CURRENT_STREAM.reset(token)
+
+
+class EndpointStats:
+    """Counters and a latency histogram for one (stream, endpoint template) pair."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.response_bytes = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.backoff_seconds = 0.0
+        self.total_seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, percent: int) -> float:
+        """Upper bound of the histogram bucket holding the given latency percentile."""
+        threshold = self.requests * percent / 100
+        seen = 0
+        for index, count in enumerate(self.histogram):
+            seen += count
+            if count and seen >= threshold:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+        return 0.0
+
+
+class RequestStats:
+    """Per-endpoint request accounting shared by every thread and task of a Client."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+
+    def _get(self, url: str) -> EndpointStats:
+        key = (CURRENT_STREAM.get() or "-", endpoint_template(url))
+        if key not in self._stats:
+            self._stats[key] = EndpointStats()
+        return self._stats[key]
+
+    def record_request(self, url: str, seconds: float, status_code: int, response_bytes: int) -> None:
+        with self._lock:
+            stats = self._get(url)
+            stats.requests += 1
+            stats.total_seconds += seconds
+            stats.response_bytes += response_bytes
+            stats.histogram[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            if status_code == 429:
+                stats.rate_limited += 1
+
+    def record_bytes(self, url: str, response_bytes: int) -> None:
+        with self._lock:
+            self._get(url).response_bytes += response_bytes
+
+    def record_backoff(self, url: str, wait: float) -> None:
+        with self._lock:
+            stats = self._get(url)
+            stats.retries += 1
+            stats.backoff_seconds += wait or 0.0
+
+    def log_summary(self) -> None:
+        """Log one line per stream and endpoint template, slowest endpoints first."""
+        with self._lock:
+            items = sorted(self._stats.items(), key=lambda item: item[1].total_seconds, reverse=True)
+            for (stream, template), stats in items:
+                percentiles = ", ".join(f"p{p}<={stats.percentile(p)}s" for p in PERCENTILES)
+                LOGGER.info(
+                    f"Request summary - stream: {stream}, endpoint: {template}, "
+                    f"requests: {stats.requests}, time: {stats.total_seconds:.1f}s, latency: {percentiles}, "
+                    f"bytes: {stats.response_bytes}, retries: {stats.retries}, "
+                    f"rate_limited: {stats.rate_limited}, backoff: {stats.backoff_seconds:.1f}s"
+                )
@@ -3,7 +3,6 @@ import json
 import singer
 from typing import Dict, Tuple
 from singer import metadata
-from tap_gitlab.streams import STREAMS
 
 LOGGER = singer.get_logger()
 
@@ -34,6 +33,9 @@ def load_schema_references() -> Dict:
 
 def get_schemas() -> Tuple[Dict, Dict]:
     """Load all schemas and generate metadata with resolved references."""
+    # Imported here so that loading the precompiled catalog does not import every stream.
+    from tap_gitlab.streams import STREAMS
+
     schemas = {}
     field_metadata = {}
     refs = load_schema_references()
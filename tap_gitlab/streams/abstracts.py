@@ -1,18 +1,26 @@
+import copy
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Tuple, Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+import threading
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Iterator
 from urllib.parse import quote
 from singer import (
     Transformer,
     get_bookmark,
     get_logger,
     metrics,
-    write_record,
-    write_schema,
     metadata
 )
-from dateutil import parser
 from datetime import datetime, timezone
 
+from tap_gitlab import output
+from tap_gitlab.exceptions import BadRequestError, MethodNotAllowedError
+from tap_gitlab.request_stats import stream_context
+from tap_gitlab.timestamps import parse_utc
+from tap_gitlab.transform import compile_transform, uses_default_options
+
 LOGGER = get_logger()
 
 
@@ -27,14 +35,33 @@ class BaseStream(ABC):
     data_key = None
     parent_bookmark_key = ""
     bookmark_value = None
+    # "offset" walks `page=N`; "keyset" follows cursor links and is cheaper on deep pages.
+    pagination = "offset"
+    # Sort key of keyset pages, also used for offset pages when it is a replication key.
+    keyset_order_by = "id"
+    # Fields read by the tap itself, kept on raw records even when they are not selected.
+    internal_fields = ("id",)
 
     def __init__(self, client=None, catalog=None) -> None:
         self.client = client
         self.catalog = catalog
+        # Each stream converts its own copy: singer's Transformer reorders schema type lists in place.
         self.schema = self.catalog.schema.to_dict() if self.catalog else None
         self.metadata = metadata.to_map(self.catalog.metadata) if self.catalog else None
         self.child_to_sync = []
+        # Per child stream, the parent IDs it keeps a bookmark for.
+        self.child_bookmarked_ids = []
+        # Parents whose children all finished earlier in an interrupted pass.
+        self.completed_parent_ids = set()
         self.params = {}
+        # Shared with clones so a rejected keyset request is not repeated per project.
+        self.keyset_unsupported = threading.Event()
+        # Record transform specialised for this schema and selection. The first
+        # record is checked against singer's Transformer; any difference turns it off.
+        self.compiled_transform = compile_transform(self.schema, self.metadata) if self.schema else None
+        self.transform_checked = threading.Event()
+        self.transform_mismatch = threading.Event()
+        self.kept_fields = self.get_kept_fields()
 
     @property
     @abstractmethod
@@ -59,53 +86,212 @@ class BaseStream(ABC):
     def is_selected(self):
         return metadata.get(self.metadata, (), "selected")
 
-    @abstractmethod
+    def get_kept_fields(self) -> Optional[frozenset]:
+        """Top-level fields worth keeping on raw records: the selected ones plus those the tap reads."""
+        if not self.schema:
+            return None
+
+        fields = set(self.internal_fields) | set(self.replication_keys or [])
+        if self.is_selected():
+            for field in self.schema.get("properties", {}):
+                breadcrumb = ("properties", field)
+                inclusion = metadata.get(self.metadata, breadcrumb, "inclusion")
+                selected = metadata.get(self.metadata, breadcrumb, "selected")
+                if inclusion == "automatic" or (selected is not False and inclusion != "unsupported"):
+                    fields.add(field)
+        return frozenset(fields)
+
+    def prune_record(self, record: Any) -> Any:
+        """Drop the fields of a raw record that are neither emitted nor read by the tap."""
+        if self.kept_fields is None or not isinstance(record, dict):
+            return record
+        return {key: value for key, value in record.items() if key in self.kept_fields}
+
     def sync(
         self,
         state: Dict,
         transformer: Transformer,
         parent_obj: Dict = None,
     ) -> Dict:
-        pass
+        """Sync the stream, fanning out to the selected child streams for every emitted record."""
+        self.start_sync(state, parent_obj)
+        with metrics.record_counter(self.tap_stream_id) as counter, self.child_executor() as executor, \
+                stream_context(self.tap_stream_id):
+            child_futures = []
+            for record in self.get_records():
+                record = self.prune_record(record)
+                if self.process_record(record, transformer, counter, parent_obj):
+                    child_futures.extend(self.sync_children(state, transformer, record, executor))
+                self.checkpoint(state)
+
+            self.wait_for_children(child_futures)
+            self.finish_pass(state)
+            self.finish_sync(state)
+            return counter.value
+
+    async def sync_async(
+        self,
+        state: Dict,
+        transformer: Transformer,
+        async_client: Any,
+        parent_obj: Dict = None,
+    ) -> int:
+        """Sync the stream on the asyncio engine. Used for child streams, which have no children of their own."""
+        self.start_sync(state, parent_obj)
+        with metrics.record_counter(self.tap_stream_id) as counter, stream_context(self.tap_stream_id):
+            async for record in self.get_records_async(async_client):
+                self.process_record(self.prune_record(record), transformer, counter, parent_obj)
+                self.checkpoint(state)
+
+            self.finish_sync(state)
+            return counter.value
+
+    def start_sync(self, state: Dict, parent_obj: Dict = None) -> None:
+        """Prepare request parameters before the first page is fetched."""
+        self.url_endpoint = self.get_url_endpoint(parent_obj)
+        if self.child_to_sync:
+            with output.LOCK:
+                self.interrupted_ids = list(self.get_in_progress(state))
+                self.completed_parent_ids = set(
+                    state.get("bookmarks", {}).get(self.tap_stream_id, {}).get("completed", [])
+                )
+                self.child_bookmarked_ids = [
+                    ids for ids in (child.bookmarked_parent_ids(state) for child in self.child_to_sync)
+                    if ids is not None
+                ]
+            if self.completed_parent_ids:
+                LOGGER.info(
+                    f"Skipping the child streams of {len(self.completed_parent_ids)} {self.tap_stream_id}"
+                    " finished in the interrupted run"
+                )
+
+    def process_record(self, record: Dict, transformer: Transformer, counter: Any, parent_obj: Dict = None) -> bool:
+        """Transform and emit one record. Returns True when its children should be synced."""
+        record = self.modify_object(record, parent_obj)
+        transformed_record = self.transform_record(record, transformer)
+        if self.is_selected():
+            output.write_record(self.tap_stream_id, transformed_record)
+            counter.increment()
+        return True
+
+    def finish_sync(self, state: Dict) -> None:
+        """Persist anything the sync accumulated, such as bookmarks."""
+
+    def bookmarked_parent_ids(self, state: Dict) -> Optional[set]:
+        """IDs of the parents this stream keeps a bookmark for, or None when it keeps none per parent."""
+        return None
+
+    def needs_backfill(self, record: Dict) -> bool:
+        """Whether a child stream that bookmarks per parent has never synced this record."""
+        parent_id = str(record.get("id"))
+        return any(parent_id not in ids for ids in self.child_bookmarked_ids)
+
+    def checkpoint(self, state: Dict) -> None:
+        """Write STATE when the client's checkpoint interval has passed."""
+        checkpointer = getattr(self.client, "checkpointer", None)
+        if checkpointer is None or not checkpointer.due():
+            return
+        with output.LOCK:
+            self.save_progress(state)
+            output.write_state(state)
+
+    def save_progress(self, state: Dict) -> None:
+        """Store the bookmarks that are safe to resume from before the sync finishes."""
 
     def get_records(self) -> Iterator:
         """Interacts with API client interaction and pagination."""
-        self.params["per_page"] = self.page_size
-        current_page = 1
-        has_more_pages = True
+        if self.pagination == "keyset" and not self.keyset_unsupported.is_set():
+            yield from self.get_keyset_records()
+        else:
+            yield from self.get_offset_records()
+
+    def get_offset_params(self) -> Dict:
+        """Request parameters for offset pages, keeping the keyset order when it is the replication key."""
+        if self.keyset_order_by in (self.replication_keys or []):
+            return dict(self.params, order_by=self.keyset_order_by, sort="asc")
+        return self.params
+
+    def get_offset_records(self) -> Iterator:
+        """Walk the collection with offset (`page=N`) pagination."""
+        yield from self.client.paginate(
+            self.path, self.get_offset_params(), endpoint=self.url_endpoint, headers=self.headers,
+            page_size=self.page_size, data_key=self.data_key,
+        )
 
-        while has_more_pages:
-            self.params["page"] = current_page
+    def get_keyset_records(self) -> Iterator:
+        """Walk the collection with keyset pagination by following `Link: rel="next"`.
 
-            response = self.client.get(
-                self.url_endpoint, self.params, self.headers, self.path
+        Endpoints that ignore the keyset parameters still return offset
+        pagination headers, which are followed the same way. Endpoints that
+        reject them fall back to offset pagination for the rest of the run.
+        """
+        params = dict(self.params, pagination="keyset", order_by=self.keyset_order_by, sort="asc")
+        params.pop("page", None)
+        records_seen = False
+        try:
+            for record in self.client.paginate(
+                self.path, params, endpoint=self.url_endpoint, headers=self.headers,
+                page_size=self.page_size, data_key=self.data_key,
+            ):
+                records_seen = True
+                yield record
+        except (BadRequestError, MethodNotAllowedError) as err:
+            if records_seen:
+                raise
+            LOGGER.info(
+                f"Keyset pagination not supported for {self.tap_stream_id}, "
+                f"falling back to offset pagination: {err}"
             )
+            self.keyset_unsupported.set()
+            yield from self.get_offset_records()
 
-            if isinstance(response, list):
-                raw_records = response
-            else:
-                raw_records = response.get(self.data_key, []) if self.data_key else response
-
-            yield from raw_records
-
-            # Check pagination headers from client response
-            # GitLab returns x-next-page header when there's a next page
-            response_headers = getattr(self.client, 'last_response_headers', {})
-            x_next_page = response_headers.get('x-next-page') or response_headers.get('X-Next-Page')
-
-            if x_next_page:
-                # GitLab indicates next page exists
-                current_page += 1
-                has_more_pages = True
-            elif not raw_records or len(raw_records) < self.page_size:
-                # No more pages if empty response or fewer records than page_size
-                has_more_pages = False
-            else:
-                # Try next page, will stop if empty
-                current_page += 1
+    async def get_records_async(self, async_client: Any) -> AsyncIterator:
+        """Async counterpart of `get_records`, paginating through the asyncio client."""
+        pagination_kwargs = dict(
+            endpoint=self.url_endpoint, headers=self.headers, page_size=self.page_size, data_key=self.data_key
+        )
+        if self.pagination == "keyset" and not self.keyset_unsupported.is_set():
+            params = dict(self.params, pagination="keyset", order_by=self.keyset_order_by, sort="asc")
+            params.pop("page", None)
+            records_seen = False
+            try:
+                async for record in async_client.paginate(self.path, params, **pagination_kwargs):
+                    records_seen = True
+                    yield record
+                return
+            except (BadRequestError, MethodNotAllowedError) as err:
+                if records_seen:
+                    raise
+                LOGGER.info(
+                    f"Keyset pagination not supported for {self.tap_stream_id}, "
+                    f"falling back to offset pagination: {err}"
+                )
+                self.keyset_unsupported.set()
+
+        async for record in async_client.paginate(self.path, self.get_offset_params(), **pagination_kwargs):
+            yield record
+
+    def transform_record(self, record: Dict, transformer: Transformer) -> Dict:
+        """Transform a record with the compiled schema, or with singer's Transformer when it cannot."""
+        if self.compiled_transform is None or self.transform_mismatch.is_set() or not uses_default_options(transformer):
+            return transformer.transform(record, self.schema, self.metadata)
+
+        success, transformed_record = self.compiled_transform(record)
+        if not success:
+            # Let singer raise SchemaMismatch with its usual details.
+            return transformer.transform(record, self.schema, self.metadata)
+
+        if not self.transform_checked.is_set():
+            self.transform_checked.set()
+            expected = transformer.transform(copy.deepcopy(record), self.schema, self.metadata)
+            if expected != transformed_record:
+                LOGGER.warning(f"Compiled transform differs for {self.tap_stream_id}, using singer's Transformer")
+                self.transform_mismatch.set()
+                return expected
+        return transformed_record
 
     def write_schema(self) -> None:
-        write_schema(self.tap_stream_id, self.schema, self.key_properties)
+        output.write_schema(self.tap_stream_id, self.schema, self.key_properties)
 
     def update_params(self, **kwargs) -> None:
         self.params.update(kwargs)
@@ -116,8 +302,174 @@ class BaseStream(ABC):
     def get_url_endpoint(self, parent_obj: Dict = None) -> str:
         return self.url_endpoint or f"{self.client.base_url}/{self.path}"
 
+    def clone(self, state: Dict) -> "BaseStream":
+        """Return a copy that can sync on a worker thread without sharing request state.
+
+        singer's Transformer reorders the `type` lists of the schema it walks, so
+        the worker gets its own copy of the schema as well.
+        """
+        worker = copy.copy(self)
+        worker.params = dict(self.params)
+        worker.schema = copy.deepcopy(self.schema)
+        return worker
+
+    @contextmanager
+    def child_executor(self) -> Iterator[Optional[Executor]]:
+        """Yield an executor for child syncs, or None when children run inline."""
+        if self.child_to_sync and getattr(self.client, "engine", None) == "asyncio":
+            # Imported here so that aiohttp is only loaded by runs that use it.
+            from tap_gitlab.async_engine import AsyncEngine
+            with AsyncEngine(self.client, self.client.max_concurrency) as engine:
+                yield engine
+            return
+
+        max_workers = getattr(self.client, "max_workers", 1)
+        if not self.child_to_sync or max_workers <= 1:
+            yield None
+            return
+
+        executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"{self.tap_stream_id}-children"
+        )
+        try:
+            yield executor
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        executor.shutdown(wait=True)
+
+    def sync_children(
+        self,
+        state: Dict,
+        transformer: Transformer,
+        parent_obj: Dict,
+        executor: Optional[Executor] = None,
+    ) -> List[Future]:
+        """Sync every selected child stream for one parent record.
+
+        Children that finished for this parent in an interrupted run are skipped.
+        """
+        if not self.child_to_sync:
+            return []
+
+        parent_id = str(parent_obj.get("id"))
+        if parent_id in self.completed_parent_ids:
+            return []
+        remaining = self.start_children(state, parent_id)
+        if executor is None:
+            for child in remaining:
+                child.sync(state=state, transformer=transformer, parent_obj=parent_obj)
+                self.complete_child(state, parent_id, child.tap_stream_id)
+            return []
+
+        futures = []
+        for child in remaining:
+            worker = child.clone(state)
+            target = worker.sync_async if getattr(executor, "runs_coroutines", False) else worker.sync
+            # Transformers collect errors as they go and are not safe to share between threads.
+            worker_transformer = Transformer(transformer.integer_datetime_fmt, transformer.pre_hook)
+            future = executor.submit(target, state=state, transformer=worker_transformer, parent_obj=parent_obj)
+            future.add_done_callback(partial(self.on_child_done, state, parent_id, child.tap_stream_id))
+            futures.append(future)
+        return futures
+
+    def get_in_progress(self, state: Dict) -> Dict[str, List[str]]:
+        """Parents whose children have not all finished, with the children that have."""
+        return state.get("bookmarks", {}).get(self.tap_stream_id, {}).get("in_progress", {})
+
+    def start_children(self, state: Dict, parent_id: str) -> List["BaseStream"]:
+        """Mark a parent as in progress and return the children it still has to sync."""
+        with output.LOCK:
+            stream_bookmarks = state.setdefault("bookmarks", {}).setdefault(self.tap_stream_id, {})
+            completed = stream_bookmarks.setdefault("in_progress", {}).setdefault(parent_id, [])
+            remaining = [child for child in self.child_to_sync if child.tap_stream_id not in completed]
+            if not remaining:
+                self.finish_parent(state, parent_id)
+            return remaining
+
+    def complete_child(self, state: Dict, parent_id: str, child_id: str) -> None:
+        """Record a finished child sync, dropping the parent once all its children are done."""
+        with output.LOCK:
+            completed = self.get_in_progress(state).get(parent_id)
+            if completed is None:
+                return
+            completed.append(child_id)
+            if {child.tap_stream_id for child in self.child_to_sync} <= set(completed):
+                self.finish_parent(state, parent_id)
+
+    def finish_parent(self, state: Dict, parent_id: str) -> None:
+        """Move a parent whose children are all done to the parents completed in this pass."""
+        stream_bookmarks = state["bookmarks"][self.tap_stream_id]
+        del stream_bookmarks["in_progress"][parent_id]
+        if not stream_bookmarks["in_progress"]:
+            del stream_bookmarks["in_progress"]
+        stream_bookmarks.setdefault("completed", []).append(parent_id)
+
+    def finish_pass(self, state: Dict) -> None:
+        """Clear the resume bookkeeping once every parent has been through a full pass.
+
+        Parents still marked in progress were not listed again, or their
+        children were skipped this run, so there is nothing left to resume for them.
+        """
+        if not self.child_to_sync:
+            return
+        with output.LOCK:
+            stream_bookmarks = state.get("bookmarks", {}).get(self.tap_stream_id)
+            if stream_bookmarks is None:
+                return
+            stale_ids = list(stream_bookmarks.pop("in_progress", {}))
+            if stale_ids:
+                LOGGER.info(f"Dropping {self.tap_stream_id} {sorted(stale_ids)} from the interrupted parents")
+            stream_bookmarks.pop("completed", None)
+            if not stream_bookmarks:
+                del state["bookmarks"][self.tap_stream_id]
+            self.completed_parent_ids = set()
+
+    def on_child_done(self, state: Dict, parent_id: str, child_id: str, future: Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self.complete_child(state, parent_id, child_id)
+
+    def resume_interrupted(self, records: Iterator[Dict]) -> Iterator[Dict]:
+        """Yield the parents interrupted in the last run first, then the others in their usual order."""
+        pending = set(getattr(self, "interrupted_ids", []))
+        if pending:
+            LOGGER.info(f"Resuming {self.tap_stream_id} {sorted(pending)} first")
+
+        deferred = []
+        for record in records:
+            record_id = str(record.get("id"))
+            if record_id in pending:
+                pending.discard(record_id)
+                yield record
+                if not pending:
+                    yield from deferred
+                    deferred = []
+            elif pending:
+                deferred.append(record)
+            else:
+                yield record
+        yield from deferred
+
+    @staticmethod
+    def wait_for_children(futures: List[Future]) -> None:
+        """Block until all submitted child syncs finish, re-raising the first failure."""
+        for future in futures:
+            future.result()
+
 
 class IncrementalStream(BaseStream):
+    # Query parameter that filters the endpoint by the bookmark, server side.
+    incremental_param = "updated_since"
+
+    @property
+    def reads_in_bookmark_order(self) -> bool:
+        """Whether records arrive in ascending replication key order, so the bookmark never moves back."""
+        return (
+            self.pagination == "keyset"
+            and not self.keyset_unsupported.is_set()
+            and self.keyset_order_by in (self.replication_keys or [])
+        )
+
     def get_bookmark(self, state: dict, stream: str, key: Any = None) -> int:
         return get_bookmark(  # pylint: disable=E1121
             state,
@@ -131,20 +483,21 @@ class IncrementalStream(BaseStream):
             return state
 
         bookmark_key = key or self.replication_keys[0]
-        current_bookmark = get_bookmark(  # pylint: disable=E1121
-            state, stream, bookmark_key, self.client.config["start_date"]
-        )
-        try:
-            value = max(current_bookmark, value)
-        except Exception:
-            LOGGER.warning("Failed to compare bookmark values. Keeping current bookmark.")
-            value = current_bookmark
-
-        if "bookmarks" not in state:
-            state["bookmarks"] = {}
-        if stream not in state["bookmarks"]:
-            state["bookmarks"][stream] = {}
-        state["bookmarks"][stream][bookmark_key] = value
+        with output.LOCK:
+            current_bookmark = get_bookmark(  # pylint: disable=E1121
+                state, stream, bookmark_key, self.client.config["start_date"]
+            )
+            try:
+                value = max(current_bookmark, value)
+            except Exception:
+                LOGGER.warning("Failed to compare bookmark values. Keeping current bookmark.")
+                value = current_bookmark
+
+            if "bookmarks" not in state:
+                state["bookmarks"] = {}
+            if stream not in state["bookmarks"]:
+                state["bookmarks"][stream] = {}
+            state["bookmarks"][stream][bookmark_key] = value
 
         return state
 
@@ -158,18 +511,15 @@ class IncrementalStream(BaseStream):
         if isinstance(value, (int, float)):
             return datetime.fromtimestamp(value).replace(tzinfo=timezone.utc)
         if isinstance(value, str):
-            dt = parser.parse(value)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            return dt.astimezone(timezone.utc)
+            return parse_utc(value)
         LOGGER.warning(f"Unsupported timestamp type: {type(value)}")
         return None
 
     def append_times_to_dates(self, record: Dict) -> Dict:
         return record
 
-    def sync(self, state: Dict, transformer: Transformer, parent_obj: Dict = None) -> Dict:
-        """Abstract implementation for `type: Incremental` stream."""
+    def start_sync(self, state: Dict, parent_obj: Dict = None) -> None:
+        """Resolve the bookmark and filter the request by it."""
         bookmark_value = self.get_bookmark(state, self.tap_stream_id)
         bookmark_date = self._to_utc_datetime(bookmark_value)
 
@@ -177,80 +527,122 @@ class IncrementalStream(BaseStream):
             LOGGER.error("Invalid bookmark date, using start_date")
             bookmark_date = self._to_utc_datetime(self.client.config["start_date"])
 
-        current_max_bookmark_date = bookmark_date
-        self.update_params(updated_since=bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z'))
-        self.url_endpoint = self.get_url_endpoint(parent_obj)
+        self.bookmark_date = bookmark_date
+        self.max_bookmark_date = bookmark_date
+        self.update_params(
+            **{self.incremental_param: bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z')}
+        )
+        super().start_sync(state, parent_obj)
 
-        with metrics.record_counter(self.tap_stream_id) as counter:
-            for record in self.get_records():
-                record = self.modify_object(record, parent_obj)
-                transformed_record = transformer.transform(record, self.schema, self.metadata)
-                self.append_times_to_dates(transformed_record)
-
-                record_value = transformed_record.get(self.replication_keys[0])
-                record_timestamp = self._to_utc_datetime(record_value)
-
-                if record_timestamp is None:
-                    LOGGER.warning(f"Skipping record with invalid {self.replication_keys[0]}: {record_value}")
-                    continue
-
-                if record_timestamp >= bookmark_date:
-                    if self.is_selected():
-                        write_record(self.tap_stream_id, transformed_record)
-                        counter.increment()
-
-                    try:
-                        current_max_bookmark_date = max(current_max_bookmark_date, record_timestamp)
-                    except TypeError:
-                        LOGGER.warning("Timestamp comparison failed, keeping current bookmark")
-
-                    for child in self.child_to_sync:
-                        child.sync(state=state, transformer=transformer, parent_obj=record)
-
-            state = self.update_bookmark_state(  # pylint: disable=E1121
-                state=state,
-                stream=self.tap_stream_id,
-                key=None,
-                value=current_max_bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z')
-            )
-            return counter.value
+    def process_record(self, record: Dict, transformer: Transformer, counter: Any, parent_obj: Dict = None) -> bool:
+        """Emit the record if it is at or past the bookmark and track the new maximum."""
+        record = self.modify_object(record, parent_obj)
+        transformed_record = self.transform_record(record, transformer)
+        self.append_times_to_dates(transformed_record)
+
+        record_value = transformed_record.get(self.replication_keys[0])
+        record_timestamp = self._to_utc_datetime(record_value)
+
+        if record_timestamp is None:
+            LOGGER.warning(f"Skipping record with invalid {self.replication_keys[0]}: {record_value}")
+            return False
+
+        if record_timestamp < self.bookmark_date:
+            # Not emitted again, but a parent new to its children is still synced for them.
+            return self.needs_backfill(record)
+
+        if self.is_selected():
+            output.write_record(self.tap_stream_id, transformed_record)
+            counter.increment()
+
+        try:
+            self.max_bookmark_date = max(self.max_bookmark_date, record_timestamp)
+        except TypeError:
+            LOGGER.warning("Timestamp comparison failed, keeping current bookmark")
+        return True
+
+    def finish_sync(self, state: Dict) -> None:
+        """Advance the stream bookmark to the newest record seen."""
+        self.update_bookmark_state(  # pylint: disable=E1121
+            state=state,
+            stream=self.tap_stream_id,
+            key=None,
+            value=self.max_bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z')
+        )
 
 class FullTableStream(BaseStream):
     """Base Class for FullTable Stream."""
 
     replication_keys = []
 
-    def sync(
-        self,
-        state: Dict,
-        transformer: Transformer,
-        parent_obj: Dict = None,
-    ) -> Dict:
-        """Abstract implementation for `type: Fulltable` stream."""
-        self.url_endpoint = self.get_url_endpoint(parent_obj)
-        with metrics.record_counter(self.tap_stream_id) as counter:
-            for record in self.get_records():
-                record = self.modify_object(record, parent_obj)
-                transformed_record = transformer.transform(
-                    record, self.schema, self.metadata
-                )
-                if self.is_selected():
-                    write_record(self.tap_stream_id, transformed_record)
-                    counter.increment()
-
-                for child in self.child_to_sync:
-                    child.sync(state=state, transformer=transformer, parent_obj=record)
+class ChildBaseStream(IncrementalStream):
+    """Base Class for Child Stream.
 
-            return counter.value
+    Bookmarks are kept per parent record, under the parent stream's name:
+    `{"bookmarks": {"issues": {"updated_at": ..., "projects": {"42": ...}}}}`.
+    The stream-level value is still advanced for older state readers.
+    """
+    parent_id = None
 
-class ChildBaseStream(IncrementalStream):
-    """Base Class for Child Stream."""
     def get_bookmark(self, state: Dict, stream: str, key: Any = None) -> int:
-        """Singleton bookmark value for child streams."""
-        if not self.bookmark_value:
-            self.bookmark_value = super().get_bookmark(state, stream)
+        """Bookmark of the parent being synced, or the default for parents without one."""
+        with output.LOCK:
+            parent_bookmarks = state.get("bookmarks", {}).get(stream, {}).get(self.parent, {})
+            if not self.bookmark_value:
+                self.bookmark_value = self.get_default_bookmark(state, stream)
+            return parent_bookmarks.get(str(self.parent_id)) or self.bookmark_value
+
+    def get_default_bookmark(self, state: Dict, stream: str) -> str:
+        """Starting point for parents that have no bookmark of their own.
+
+        Once per-parent bookmarks exist, a new parent backfills from
+        `start_date`. State written before then only has the stream-level
+        value, which every parent resumes from.
+        """
+        if self.parent in state.get("bookmarks", {}).get(stream, {}):
+            return self.client.config["start_date"]
+        return super().get_bookmark(state, stream)
+
+    def bookmarked_parent_ids(self, state: Dict) -> Optional[set]:
+        return set(state.get("bookmarks", {}).get(self.tap_stream_id, {}).get(self.parent, {}))
+
+    def update_parent_bookmark(self, state: Dict, stream: str, value: str) -> Dict:
+        """Record the bookmark of the parent being synced."""
+        with output.LOCK:
+            stream_bookmarks = state.setdefault("bookmarks", {}).setdefault(stream, {})
+            stream_bookmarks.setdefault(self.parent, {})[str(self.parent_id)] = value
+        return state
+
+    def start_sync(self, state: Dict, parent_obj: Dict = None) -> None:
+        self.parent_id = (parent_obj or {}).get("id")
+        super().start_sync(state, parent_obj)
+
+    def finish_sync(self, state: Dict) -> None:
+        """Advance the parent's bookmark, then the stream-level one."""
+        self.update_parent_bookmark(
+            state,
+            self.tap_stream_id,
+            self.max_bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z'),
+        )
+        super().finish_sync(state)
+
+    def save_progress(self, state: Dict) -> None:
+        """Save the parent's bookmark mid-stream when records arrive in bookmark order.
+
+        Every record before the newest one seen has then been emitted, and
+        records at the bookmark itself are read again on resume.
+        """
+        if self.reads_in_bookmark_order:
+            self.update_parent_bookmark(
+                state,
+                self.tap_stream_id,
+                self.max_bookmark_date.isoformat(timespec='seconds').replace('+00:00', 'Z'),
+            )
 
-        return self.bookmark_value
+    def clone(self, state: Dict) -> "ChildBaseStream":
+        """Resolve the default bookmark before copying so it is decided before any parent finishes."""
+        self.get_bookmark(state, self.tap_stream_id)
+        return super().clone(state)
 
     def get_url(self, parent_obj: Dict[str, Any]) -> str:
         """Construct the URL for child stream using parent object id"""
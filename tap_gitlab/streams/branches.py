@@ -1,7 +1,21 @@
+from datetime import datetime, timezone
 from typing import Dict, Any
 from urllib.parse import quote
+from singer import Transformer
+from tap_gitlab import output
 from tap_gitlab.streams.abstracts import FullTableStream
 
+# Leading characters of the head commit SHA kept in the branch index.
+SHA_PREFIX_LENGTH = 12
+BRANCH_FLAGS = (("merged", "m"), ("protected", "p"), ("default", "d"))
+
+
+def branch_fingerprint(record: Dict) -> str:
+    """Compact summary of a branch: its head SHA prefix and merged/protected/default flags."""
+    sha = ((record.get("commit") or {}).get("id") or "")[:SHA_PREFIX_LENGTH]
+    flags = "".join(flag for field, flag in BRANCH_FLAGS if record.get(field))
+    return f"{sha}:{flags}" if flags else sha
+
 
 class Branches(FullTableStream):
     tap_stream_id = "branches"
@@ -11,6 +25,9 @@ class Branches(FullTableStream):
     replication_keys = None
     path = "projects/{}/repository/branches"
     data_key = None
+    incremental = False
+    emit_tombstones = False
+    internal_fields = ("name", "commit", "merged", "protected", "default")
 
     def get_url(self, parent_obj: Dict[str, Any]) -> str:
         """Construct the URL for fetching users of a specific project."""
@@ -36,3 +53,42 @@ class Branches(FullTableStream):
                 record["project_id"] = parent_record.get("id")
 
         return record
+
+    def start_sync(self, state: Dict, parent_obj: Dict = None) -> None:
+        """Load the project's branch index when only changed branches are emitted."""
+        super().start_sync(state, parent_obj)
+        self.incremental = str(self.client.config.get("incremental_branches", "")).lower() in ("true", "1")
+        self.emit_tombstones = str(self.client.config.get("branch_tombstones", "")).lower() in ("true", "1")
+        self.project_id = (parent_obj or {}).get("id")
+        with output.LOCK:
+            index = state.get("bookmarks", {}).get(self.tap_stream_id, {}).get("projects", {})
+            self.previous_index = dict(index.get(str(self.project_id), {}))
+        self.current_index = {}
+
+    def process_record(self, record: Dict, transformer: Transformer, counter: Any, parent_obj: Dict = None) -> bool:
+        """Emit the branch unless its head commit and flags match the last run."""
+        if not self.incremental:
+            return super().process_record(record, transformer, counter, parent_obj)
+
+        fingerprint = branch_fingerprint(record)
+        self.current_index[record.get("name")] = fingerprint
+        if self.previous_index.get(record.get("name")) == fingerprint:
+            return True
+        return super().process_record(record, transformer, counter, parent_obj)
+
+    def finish_sync(self, state: Dict) -> None:
+        """Emit tombstones for deleted branches and store the project's branch index."""
+        if not self.incremental:
+            return
+
+        if self.emit_tombstones and self.is_selected():
+            deleted_at = datetime.now(timezone.utc).isoformat(timespec='seconds').replace('+00:00', 'Z')
+            for name in sorted(set(self.previous_index) - set(self.current_index)):
+                output.write_record(
+                    self.tap_stream_id,
+                    {"project_id": self.project_id, "name": name, "_sdc_deleted_at": deleted_at},
+                )
+
+        with output.LOCK:
+            index = state.setdefault("bookmarks", {}).setdefault(self.tap_stream_id, {}).setdefault("projects", {})
+            index[str(self.project_id)] = self.current_index
@@ -10,6 +10,9 @@ class Commits(ChildBaseStream):
     path = "projects/{}/repository/commits"
     data_key = None
     bookmark_value = None
+    pagination = "keyset"
+    # The repository commits API ignores updated_since and filters by committed date with `since`.
+    incremental_param = "since"
 
     def modify_object(self, record, parent_record = None):
         """Adding project_id to the record."""
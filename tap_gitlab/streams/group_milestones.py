@@ -10,3 +10,4 @@ class GroupMilestones(ChildBaseStream):
     path = "groups/{}/milestones"
     data_key = None
     bookmark_value = None
+    incremental_param = "updated_after"
@@ -1,5 +1,5 @@
 from typing import Dict, Iterator
-from singer import get_logger, Transformer
+from singer import get_logger, metadata, Transformer
 from urllib.parse import quote
 
 from tap_gitlab.streams.abstracts import FullTableStream
@@ -28,16 +28,11 @@ class Groups(FullTableStream):
         return group_ids
 
     def modify_object(self, record: Dict, parent_record: Dict = None) -> Dict:
-        """Collect project IDs from group records."""
-        # Check if this group has projects
-        if 'projects' in record and isinstance(record['projects'], list):
-            if not hasattr(self, '_collected_project_ids'):
-                self._collected_project_ids = set()
-
-            for project in record['projects']:
-                if isinstance(project, dict) and 'id' in project:
-                    encoded_id = quote(str(project['id']), safe='')
-                    self._collected_project_ids.add(encoded_id)
+        """Collect group IDs so their projects can be listed afterwards."""
+        if isinstance(record, dict) and 'id' in record:
+            if not hasattr(self, '_collected_group_ids'):
+                self._collected_group_ids = []
+            self._collected_group_ids.append(record['id'])
 
         return record
 
@@ -49,7 +44,11 @@ class Groups(FullTableStream):
         return f"{self.client.base_url}/groups"
 
     def get_records(self) -> Iterator:
-        """Override to fetch records for each group ID from config."""
+        """Yield the groups, starting with any whose children were interrupted in the last run."""
+        yield from self.resume_interrupted(self.list_groups())
+
+    def list_groups(self) -> Iterator:
+        """Fetch records for each group ID from config."""
         group_ids = self.get_group_ids()
 
         for group_id in group_ids:
@@ -57,7 +56,11 @@ class Groups(FullTableStream):
                 self._current_group_id = group_id
                 LOGGER.info(f"Syncing group: {group_id}")
                 endpoint = self.get_url_endpoint()
-                response = self.client.get(endpoint, self.params, self.headers, None)
+                params = self.params
+                if not self.is_projects_field_selected():
+                    # Projects are listed page by page later; skip the embedded, unpaginated copy.
+                    params = dict(params, with_projects="false")
+                response = self.client.get_cached(endpoint, params, self.headers, None)
 
                 if isinstance(response, dict):
                     yield response
@@ -89,27 +92,32 @@ class Groups(FullTableStream):
         if projects_stream.is_selected() and "groups" in streams_to_sync:
             # Get config project IDs
             config_projects = self.client.config.get("projects", "").strip().replace(",", " ").split()
-            config_project_ids = set(config_projects)
 
-            # Get group project IDs (if any were collected)
-            group_project_ids = self._collected_project_ids if hasattr(self, '_collected_project_ids') else set()
-
-            # Merge both sets to get all unique project IDs
-            all_project_ids = config_project_ids | group_project_ids
+            # Get group IDs (if any were synced)
+            group_ids = self._collected_group_ids if hasattr(self, '_collected_group_ids') else []
 
             # Write schema for projects
             sync_write_schema(projects_stream, self.client, streams_to_sync, catalog)
 
-            # Sync with all project IDs
+            # List the projects of every group, then fetch config projects not already listed
             projects_stream.sync(
                 state=state,
                 transformer=transformer,
-                project_ids_list=list(all_project_ids)
+                project_ids_list=list(dict.fromkeys(config_projects)),
+                group_ids_list=group_ids
             )
         else:
             LOGGER.info("Projects stream not selected - skipping projects sync from group")
 
-        if hasattr(self, '_collected_project_ids'):
-            delattr(self, '_collected_project_ids')
+        if hasattr(self, '_collected_group_ids'):
+            delattr(self, '_collected_group_ids')
 
         return total_records
+
+    def is_projects_field_selected(self) -> bool:
+        """Whether the embedded `projects` array is emitted with the group records."""
+        breadcrumb = ("properties", "projects")
+        inclusion = metadata.get(self.metadata, breadcrumb, "inclusion")
+        if inclusion == "automatic":
+            return True
+        return metadata.get(self.metadata, breadcrumb, "selected") is not False and inclusion != "unsupported"
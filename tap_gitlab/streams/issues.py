@@ -10,6 +10,10 @@ class Issues(ChildBaseStream):
     path = "projects/{}/issues"
     data_key = None
     bookmark_value = None
+    # GitLab answers keyset requests for issues with 405, so issues use offset
+    # pages, requested in updated_at order.
+    keyset_order_by = "updated_at"
+    incremental_param = "updated_after"
 
     def modify_object(self, record, parent_record = None):
         """Adding project_id to the record."""
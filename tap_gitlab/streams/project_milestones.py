@@ -10,6 +10,7 @@ class ProjectMilestones(ChildBaseStream):
     path = "projects/{}/milestones"
     data_key = None
     bookmark_value = None
+    incremental_param = "updated_after"
 
     def modify_object(self, record, parent_record = None):
         """Adding project_id to the record."""
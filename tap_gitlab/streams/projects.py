@@ -1,11 +1,20 @@
+from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, Iterator
-from singer import get_logger
-from urllib.parse import quote
+from singer import get_logger, Transformer
+from urllib.parse import quote, unquote
 
+from tap_gitlab import output
 from tap_gitlab.streams.abstracts import IncrementalStream
+from tap_gitlab.timestamps import parse_utc
 
 LOGGER = get_logger()
 
+# Project fields and repository statistics that change whenever a child stream has new data.
+ACTIVITY_FIELDS = ("last_activity_at", "updated_at")
+ACTIVITY_STATISTICS = ("commit_count", "repository_size")
+# Children of an unchanged project are still synced once their last sync is this old.
+DEFAULT_ACTIVITY_MAX_AGE_HOURS = 24
+
 class Projects(IncrementalStream):
     tap_stream_id = "projects"
     key_properties = ["id"]
@@ -14,6 +23,11 @@ class Projects(IncrementalStream):
     path = "projects/{}"
     data_key = None
     children = ["branches", "issues", "commits", "project_milestones", "users"]
+    skip_inactive = False
+    skip_archived = False
+    internal_fields = ("id", "archived", "last_activity_at", "updated_at", "statistics")
+    # Applies to the paginated group project listings; single projects are fetched by ID.
+    pagination = "keyset"
 
     def get_project_ids(self) -> list:
         """Parse comma and/or space-separated project IDs from config."""
@@ -33,13 +47,22 @@ class Projects(IncrementalStream):
             return f"{self.client.base_url}/projects/{encoded_id}"
         return f"{self.client.base_url}/projects"
 
-    def sync(self, state: Dict, transformer: Any, parent_obj: Dict = None, project_ids_list: list = None) -> int:
+    def sync(
+            self,
+            state: Dict,
+            transformer: Any,
+            parent_obj: Dict = None,
+            project_ids_list: list = None,
+            group_ids_list: list = None
+        ) -> int:
         """Override sync to handle both config project IDs and group projects."""
-        if project_ids_list:
-            # Called with explicit project IDs list (e.g., from groups)
-            self._project_ids_override = project_ids_list
+        if project_ids_list is not None or group_ids_list:
+            # Called with explicit project and group IDs (e.g., from groups)
+            self._project_ids_override = project_ids_list or []
+            self._group_ids_override = group_ids_list or []
             result = super().sync(state=state, transformer=transformer, parent_obj=None)
             delattr(self, '_project_ids_override')
+            delattr(self, '_group_ids_override')
             return result
 
         # Called independently - sync projects from config
@@ -47,7 +70,11 @@ class Projects(IncrementalStream):
         return super().sync(state=state, transformer=transformer, parent_obj=None)
 
     def get_records(self) -> Iterator:
-        """Override to fetch records for each project ID from config."""
+        """Yield the projects, starting with any whose children were interrupted in the last run."""
+        yield from self.resume_interrupted(self.list_projects())
+
+    def list_projects(self) -> Iterator:
+        """List the projects of each group, then fetch the remaining config project IDs."""
         # Use override list if provided, otherwise get from config
         if hasattr(self, '_project_ids_override'):
             project_ids = self._project_ids_override
@@ -55,13 +82,122 @@ class Projects(IncrementalStream):
         else:
             project_ids = self.get_project_ids()
 
+        # IDs and paths of listed projects, which need no request of their own.
+        seen = set()
+        for group_id in getattr(self, '_group_ids_override', []):
+            LOGGER.info(f"Listing projects of group: {group_id}")
+            for record in self.get_group_projects(group_id):
+                if str(record.get("id")) in seen:
+                    continue
+                seen.update((str(record.get("id")), record.get("path_with_namespace")))
+                yield record
+
         for project_id in project_ids:
+            if unquote(str(project_id)) in seen:
+                continue
             self._current_project_id = project_id
             LOGGER.info(f"Syncing project: {project_id}")
             endpoint = self.get_url_endpoint()
-            response = self.client.get(endpoint, self.params, self.headers, None)
+            # `GET /projects/:id` ignores the incremental filter; leaving it out keeps the
+            # URL, and so the ETag cache key, stable while the bookmark moves.
+            params = {key: value for key, value in self.params.items() if key != self.incremental_param}
+            response = self.client.get_cached(endpoint, params, self.headers, None)
 
             if isinstance(response, dict):
                 yield response
             else:
                 LOGGER.warning(f"Unexpected response type for project {project_id}: {type(response)}")
+
+    def get_group_projects(self, group_id: Any) -> Iterator:
+        """Page through `/groups/:id/projects`, honouring the include_subgroups and with_shared options."""
+        config = self.client.config
+        self.url_endpoint = f"{self.client.base_url}/groups/{quote(str(group_id), safe='')}/projects"
+        params = self.params
+        listing_params = params
+        if self.child_to_sync:
+            # Projects older than the bookmark are still listed, so children can backfill new ones.
+            listing_params = {key: value for key, value in params.items() if key != self.incremental_param}
+        self.params = dict(
+            listing_params,
+            include_subgroups="true" if str(config.get("include_subgroups", "")).lower() in ("true", "1") else "false",
+            with_shared="true" if str(config.get("with_shared", "")).lower() in ("true", "1") else "false",
+        )
+        try:
+            yield from super().get_records()
+        finally:
+            self.params = params
+
+    def start_sync(self, state: Dict, parent_obj: Dict = None) -> None:
+        """Load the activity watermarks used to skip the children of unchanged projects."""
+        self.skip_inactive = str(self.client.config.get("skip_inactive_projects", "")).lower() in ("true", "1")
+        self.skip_archived = str(self.client.config.get("skip_archived_projects", "")).lower() in ("true", "1")
+        if self.skip_inactive:
+            self.update_params(statistics="true")
+        max_age_hours = self.client.config.get("skip_inactive_max_age_hours")
+        self.activity_max_age = timedelta(
+            hours=float(DEFAULT_ACTIVITY_MAX_AGE_HOURS if max_age_hours in (None, "") else max_age_hours)
+        )
+        self.sync_started_at = datetime.now(timezone.utc)
+        with output.LOCK:
+            self.activity_watermarks = dict(
+                state.get("bookmarks", {}).get(self.tap_stream_id, {}).get("activity", {})
+            )
+        self.pending_watermarks = {}
+        super().start_sync(state, parent_obj)
+
+    def process_record(self, record: Dict, transformer: Transformer, counter: Any, parent_obj: Dict = None) -> bool:
+        """Emit the project; sync its children unless it is archived or unchanged since the last run."""
+        if not super().process_record(record, transformer, counter, parent_obj):
+            return False
+        if not self.child_to_sync:
+            return True
+
+        project_id = str(record.get("id"))
+        if self.skip_archived and record.get("archived"):
+            LOGGER.info(f"Skipping child streams of archived project {project_id}")
+            return False
+
+        if self.skip_inactive:
+            watermark = self.get_activity_watermark(record)
+            if self.is_unchanged(self.activity_watermarks.get(project_id), watermark):
+                LOGGER.info(f"Skipping child streams of project {project_id}, no activity since the last sync")
+                return False
+            # Saved only once the children have synced, so a failed run retries the project.
+            self.pending_watermarks[project_id] = dict(
+                watermark, synced_at=self.sync_started_at.isoformat(timespec="seconds").replace("+00:00", "Z")
+            )
+        return True
+
+    def is_unchanged(self, saved: Dict, watermark: Dict) -> bool:
+        """Whether a saved watermark matches the project and is recent enough to skip its children.
+
+        Some changes never move the watermark, and GitLab throttles
+        `last_activity_at`, so children are synced again once the saved
+        watermark is older than `skip_inactive_max_age_hours` (0 never expires it).
+        """
+        if not saved or {key: value for key, value in saved.items() if key != "synced_at"} != watermark:
+            return False
+        if not self.activity_max_age:
+            return True
+        synced_at = saved.get("synced_at")
+        return synced_at is not None and self.sync_started_at - parse_utc(synced_at) < self.activity_max_age
+
+    def finish_sync(self, state: Dict) -> None:
+        super().finish_sync(state)
+        if not self.pending_watermarks:
+            return
+        with output.LOCK:
+            stream_bookmarks = state.setdefault("bookmarks", {}).setdefault(self.tap_stream_id, {})
+            stream_bookmarks.setdefault("activity", {}).update(self.pending_watermarks)
+
+    def get_activity_watermark(self, record: Dict) -> Dict:
+        """Summarise what changes when a project has new commits, issues, milestones, branches or members.
+
+        The selected child streams are part of the watermark, so selecting a
+        new one syncs every project again.
+        """
+        statistics = record.get("statistics") or {}
+        watermark = {field: record.get(field) for field in ACTIVITY_FIELDS}
+        watermark.update({field: statistics.get(field) for field in ACTIVITY_STATISTICS})
+        watermark["streams"] = sorted(child.tap_stream_id for child in self.child_to_sync)
+        return {key: value for key, value in watermark.items() if value is not None}
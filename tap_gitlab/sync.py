@@ -1,5 +1,6 @@
 import singer
 from typing import Dict
+from tap_gitlab import output
 from tap_gitlab.streams import STREAMS
 from tap_gitlab.client import Client
 
@@ -11,7 +12,7 @@ def update_currently_syncing(state: Dict, stream_name: str) -> None:
         del state["currently_syncing"]
     else:
         singer.set_currently_syncing(state, stream_name)
-    singer.write_state(state)
+    output.write_state(state)
 
 def write_schema(stream, client, streams_to_sync, catalog) -> None:
     """Write schema for stream and its children if applicable."""
@@ -34,6 +35,10 @@ def sync(client: Client, config: Dict, catalog: singer.Catalog, state) -> None:
     original_streams_to_sync = streams_to_sync.copy()
     last_stream = singer.get_currently_syncing(state)
     LOGGER.info("last/currently syncing stream: {}".format(last_stream))
+    if last_stream in streams_to_sync:
+        # Resume the interrupted stream first; its interrupted projects are resumed first in turn.
+        index = streams_to_sync.index(last_stream)
+        streams_to_sync = streams_to_sync[index:] + streams_to_sync[:index]
 
     with singer.Transformer() as transformer:
         # Check if we need to skip projects independent sync
@@ -72,3 +77,6 @@ def sync(client: Client, config: Dict, catalog: singer.Catalog, state) -> None:
 
             update_currently_syncing(state, None)
             LOGGER.info(f"FINISHED Syncing: {stream_name}, total_records: {total_records}")
+
+    output.flush()
+    client.request_stats.log_summary()
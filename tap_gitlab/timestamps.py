@@ -0,0 +1,46 @@
+import re
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from dateutil import parser
+from singer.transform import string_to_datetime
+from singer.utils import strftime
+
+# The timestamp shapes GitLab returns, e.g. `2021-03-04T05:06:07.123Z` or
+# `2021-03-04T05:06:07.123+02:00`. Anything else goes through dateutil.
+ISO_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{3}|\.\d{6})?(Z|[+-]\d{2}:\d{2})?")
+CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_utc(value: str) -> datetime:
+    """Parse a timestamp string into an aware UTC datetime; naive values are taken as UTC."""
+    parsed = None
+    if ISO_TIMESTAMP.fullmatch(value):
+        try:
+            parsed = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+        except ValueError:
+            parsed = None
+    if parsed is None:
+        parsed = parser.parse(value)
+    if parsed.tzinfo is None:
+        return parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _format_singer_datetime(value: str) -> Optional[str]:
+    if not ISO_TIMESTAMP.fullmatch(value):
+        return string_to_datetime(value)
+    try:
+        return strftime(parse_utc(value))
+    except ValueError:
+        return string_to_datetime(value)
+
+
+def to_singer_datetime(value) -> Optional[str]:
+    """Same result as singer's `string_to_datetime`, with a fast path for GitLab's timestamps."""
+    if isinstance(value, str):
+        return _format_singer_datetime(value)
+    return string_to_datetime(value)
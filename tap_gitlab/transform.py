@@ -0,0 +1,198 @@
+import decimal
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from singer import Transformer, metadata as singer_metadata
+from singer.transform import NO_INTEGER_DATETIME_PARSING
+
+from tap_gitlab.timestamps import to_singer_datetime
+
+# A compiled converter returns (success, value), like `Transformer.transform_recur`.
+Converter = Callable[[Any], Tuple[bool, Any]]
+
+
+def _keep(data: Any) -> Tuple[bool, Any]:
+    return True, data
+
+
+def _null(data: Any) -> Tuple[bool, Any]:
+    if data is None or data == "":
+        return True, None
+    return False, None
+
+
+def _datetime(data: Any) -> Tuple[bool, Any]:
+    if data is None or data == "":
+        return False, None
+    data = to_singer_datetime(data)
+    return (data is not None), data
+
+
+def _decimal(data: Any) -> Tuple[bool, Any]:
+    if isinstance(data, (str, float, int)):
+        try:
+            return True, str(decimal.Decimal(str(data)))
+        except Exception:  # pylint: disable=broad-except
+            return False, None
+    if isinstance(data, decimal.Decimal):
+        try:
+            return True, "NaN" if data.is_snan() else str(data)
+        except Exception:  # pylint: disable=broad-except
+            return False, None
+    return False, None
+
+
+def _string(data: Any) -> Tuple[bool, Any]:
+    if data is None:
+        return False, None
+    try:
+        return True, str(data)
+    except Exception:  # pylint: disable=broad-except
+        return False, None
+
+
+def _integer(data: Any) -> Tuple[bool, Any]:
+    if isinstance(data, str):
+        data = data.replace(",", "")
+    try:
+        return True, int(data)
+    except Exception:  # pylint: disable=broad-except
+        return False, None
+
+
+def _number(data: Any) -> Tuple[bool, Any]:
+    if isinstance(data, str):
+        data = data.replace(",", "")
+    try:
+        return True, float(data)
+    except Exception:  # pylint: disable=broad-except
+        return False, None
+
+
+def _boolean(data: Any) -> Tuple[bool, Any]:
+    if isinstance(data, str) and data.lower() == "false":
+        return True, False
+    try:
+        return True, bool(data)
+    except Exception:  # pylint: disable=broad-except
+        return False, None
+
+
+def _generic(schema: Dict) -> Converter:
+    """Defer to singer for schema features that are not compiled."""
+    def convert(data: Any) -> Tuple[bool, Any]:
+        return Transformer().transform_recur(data, schema, [])
+    return convert
+
+
+def _first_success(converters: list) -> Converter:
+    def convert(data: Any) -> Tuple[bool, Any]:
+        for converter in converters:
+            success, value = converter(data)
+            if success:
+                return True, value
+        return False, None
+    return convert
+
+
+def _object(properties: Dict, excluded: Set[str]) -> Converter:
+    if not properties:
+        # Singer leaves objects without declared properties untouched.
+        def convert_any(data: Any) -> Tuple[bool, Any]:
+            if not isinstance(data, dict):
+                return False, data
+            return True, {key: value for key, value in data.items() if key not in excluded}
+        return convert_any
+
+    converters = {key: compile_schema(sub_schema) for key, sub_schema in properties.items() if key not in excluded}
+
+    def convert(data: Any) -> Tuple[bool, Any]:
+        if not isinstance(data, dict):
+            return False, data
+        result = {}
+        for key, value in data.items():
+            converter = converters.get(key)
+            if converter is None:
+                continue
+            success, result[key] = converter(value)
+            if not success:
+                return False, None
+        return True, result
+    return convert
+
+
+def _array(items: Dict) -> Converter:
+    item_converter = compile_schema(items)
+
+    def convert(data: Any) -> Tuple[bool, Any]:
+        if not isinstance(data, list):
+            return False, data
+        result = []
+        for row in data:
+            success, value = item_converter(row)
+            if not success:
+                return False, None
+            result.append(value)
+        return True, result
+    return convert
+
+
+def _compile_type(typ: str, schema: Dict, excluded: Set[str]) -> Converter:
+    if typ == "null":
+        return _null
+    if typ == "string" and schema.get("format") == "date-time":
+        return _datetime
+    if typ == "string" and schema.get("format") == "singer.decimal":
+        return _decimal
+    if typ == "object":
+        if schema.get("patternProperties"):
+            return _generic(dict(schema, type=typ))
+        return _object(schema.get("properties", {}), excluded)
+    if typ == "array":
+        return _array(schema["items"])
+    return {"string": _string, "integer": _integer, "number": _number, "boolean": _boolean}.get(
+        typ, lambda data: (False, None)
+    )
+
+
+def compile_schema(schema: Dict, excluded: Set[str] = frozenset()) -> Converter:
+    """
+    Compile a JSON schema into a converter that gives the same result as
+    `Transformer.transform_recur`, without re-reading the schema per value.
+    `excluded` lists top-level properties dropped by the field selection.
+    """
+    if "anyOf" in schema:
+        return _first_success([compile_schema(sub_schema) for sub_schema in schema["anyOf"]])
+    if "type" not in schema:
+        return _keep
+
+    types = schema["type"] if isinstance(schema["type"], list) else [schema["type"]]
+    # Singer tries "null" last.
+    types = [typ for typ in types if typ != "null"] + [typ for typ in types if typ == "null"]
+    converters = [_compile_type(typ, schema, excluded) for typ in types]
+    return converters[0] if len(converters) == 1 else _first_success(converters)
+
+
+def compile_transform(schema: Dict, mdata: Optional[Dict]) -> Optional[Converter]:
+    """
+    Compile a stream's schema and field selection into a record converter.
+
+    Returns None when the selection filters nested fields, which only the
+    generic transformer handles.
+    """
+    excluded = set()
+    for breadcrumb in (mdata or {}):
+        if not breadcrumb:
+            continue
+        selected = singer_metadata.get(mdata, breadcrumb, "selected")
+        inclusion = singer_metadata.get(mdata, breadcrumb, "inclusion")
+        if inclusion == "automatic" or not (selected is False or inclusion == "unsupported"):
+            continue
+        if len(breadcrumb) != 2 or breadcrumb[0] != "properties":
+            return None
+        excluded.add(breadcrumb[1])
+    return compile_schema(schema, excluded)
+
+
+def uses_default_options(transformer: Transformer) -> bool:
+    """Whether a Transformer behaves like the one the converters were compiled for."""
+    return transformer.pre_hook is None and transformer.integer_datetime_fmt == NO_INTEGER_DATETIME_PARSING
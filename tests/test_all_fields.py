@@ -7,6 +7,9 @@ class AllFields(AllFieldsTest, BaseTest):
     the replication of all fields."""
 
     MISSING_FIELDS = {
+        "branches": {
+            "_sdc_deleted_at",
+        },
         "groups": {
             "repository_storage",
         },
@@ -0,0 +1,45 @@
+"""Scaffolding shared by the stream tests: selected streams from the discovered catalog, synced against a fake API."""
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from singer import Transformer, metadata
+
+from tap_gitlab.client import Client
+from tap_gitlab.streams import STREAMS
+
+BASE_URL = "https://gitlab.com/api/v4"
+
+
+def select(catalog_entry, selected=True, deselected=()):
+    """Mark a catalog entry as selected, with the given top-level fields deselected."""
+    mdata = metadata.write(metadata.to_map(catalog_entry.metadata), (), "selected", selected)
+    for field in deselected:
+        mdata = metadata.write(mdata, ("properties", field), "selected", False)
+    catalog_entry.metadata = metadata.to_list(mdata)
+    return catalog_entry
+
+
+def get_stream(client, catalog, stream_name, selected=True, deselected=()):
+    """Build a stream instance from its selected catalog entry."""
+    return STREAMS[stream_name](client, select(catalog.get_stream(stream_name), selected, deselected))
+
+
+def make_client(**config):
+    return Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z", **config})
+
+
+@contextmanager
+def fake_api(side_effect=None, return_value=None, write_record=None):
+    """
+    Answer `Client.get` with `side_effect` or `return_value`, and hand every
+    written record to `write_record(stream_name, record)`. Yields the
+    Transformer to sync with. `Client.get` is left alone when neither is given.
+    """
+    with patch("tap_gitlab.output.write_record", side_effect=write_record), \
+            patch("tap_gitlab.output.write_schema"), \
+            Transformer() as transformer:
+        if side_effect is None and return_value is None:
+            yield transformer
+            return
+        with patch.object(Client, "get", side_effect=side_effect, return_value=return_value):
+            yield transformer
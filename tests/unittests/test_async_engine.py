@@ -0,0 +1,97 @@
+import asyncio
+import threading
+import unittest
+
+from helpers import fake_api, get_stream, make_client
+from tap_gitlab.async_engine import AsyncClient
+from tap_gitlab.discover import discover
+from tap_gitlab.exceptions import NotFoundError
+
+try:
+    from aiohttp import web
+except ImportError:
+    web = None
+
+
+class FakeGitLab:
+    """Local GitLab API stand-in serving two projects with two pages of issues each."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.private_tokens = set()
+
+    async def project(self, request):
+        self.private_tokens.add(request.headers.get("PRIVATE-TOKEN"))
+        project_id = int(request.match_info["id"])
+        if project_id == 404:
+            return web.json_response({"message": "404 Project Not Found"}, status=404)
+        return web.json_response({"id": project_id, "updated_at": "2021-01-01T00:00:00Z"})
+
+    async def issues(self, request):
+        self.private_tokens.add(request.headers.get("PRIVATE-TOKEN"))
+        project_id = int(request.match_info["id"])
+        page = int(request.query.get("page", 1))
+        headers = {"X-Next-Page": "2"} if page == 1 else {}
+        records = [{"id": project_id * 100 + page, "updated_at": "2021-02-01T00:00:00Z"}]
+        return web.json_response(records, headers=headers)
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get("/api/v4/projects/{id}", self.project)
+        app.router.add_get("/api/v4/projects/{id}/issues", self.issues)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    def start(self):
+        self.thread.start()
+        return asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+@unittest.skipIf(web is None, "aiohttp is not installed")
+class TestAsyncEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.server = FakeGitLab()
+        port = self.server.start()
+        self.client = make_client(
+            api_url=f"http://127.0.0.1:{port}", projects="1 2", engine="asyncio", max_concurrency=4
+        )
+
+    def tearDown(self):
+        self.client._session.close()
+        self.server.stop()
+
+    def test_child_streams_sync_as_tasks(self):
+        catalog = discover()
+        projects = get_stream(self.client, catalog, "projects")
+        projects.child_to_sync.append(get_stream(self.client, catalog, "issues"))
+
+        records = []
+        state = {}
+        with fake_api(write_record=lambda s, r: records.append((s, r["id"]))) as transformer:
+            projects.sync(state=state, transformer=transformer)
+
+        self.assertEqual(sorted(r for s, r in records if s == "issues"), [101, 102, 201, 202])
+        self.assertEqual(state["bookmarks"]["issues"]["updated_at"], "2021-02-01T00:00:00Z")
+        self.assertEqual(self.server.private_tokens, {"dummy_token"})
+
+    def test_errors_are_mapped_like_the_sync_client(self):
+        async def fetch():
+            async_client = AsyncClient(self.client, 2)
+            try:
+                await async_client.get(None, {}, {}, path="projects/404")
+            finally:
+                await async_client.close()
+
+        with self.assertRaises(NotFoundError):
+            asyncio.run(fetch())
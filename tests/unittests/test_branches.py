@@ -0,0 +1,52 @@
+import unittest
+
+from helpers import fake_api, get_stream, make_client
+from tap_gitlab.discover import discover
+
+
+def branch(name, sha, **flags):
+    return {"name": name, "commit": {"id": sha}, **flags}
+
+
+class TestIncrementalBranches(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = discover()
+
+    def _sync(self, branches, state, **config):
+        stream = get_stream(make_client(**config), self.catalog, "branches")
+        records = []
+        with fake_api(return_value=branches, write_record=lambda _, record: records.append(record)) as transformer:
+            stream.sync(state=state, transformer=transformer, parent_obj={"id": 7})
+        return records
+
+    def test_full_table_by_default(self):
+        state = {}
+        branches = [branch("main", "a" * 40, default=True), branch("feature", "b" * 40)]
+        self.assertEqual(len(self._sync(branches, state)), 2)
+        self.assertEqual(len(self._sync(branches, state)), 2)
+        self.assertEqual(state, {})
+
+    def test_only_changed_branches_are_emitted(self):
+        state = {}
+        branches = [branch("main", "a" * 40, default=True), branch("feature", "b" * 40)]
+        self.assertEqual(len(self._sync(branches, state, incremental_branches=True)), 2)
+        self.assertEqual(
+            state["bookmarks"]["branches"]["projects"]["7"], {"main": "aaaaaaaaaaaa:d", "feature": "bbbbbbbbbbbb"}
+        )
+
+        branches = [branch("main", "c" * 40, default=True), branch("feature", "b" * 40, merged=True)]
+        records = self._sync(branches, state, incremental_branches=True)
+        self.assertEqual([record["name"] for record in records], ["main", "feature"])
+        self.assertEqual(self._sync(branches, state, incremental_branches=True), [])
+
+    def test_deleted_branches_emit_tombstones(self):
+        state = {}
+        self._sync([branch("main", "a" * 40), branch("stale", "b" * 40)], state, incremental_branches=True)
+
+        records = self._sync([branch("main", "a" * 40)], state, incremental_branches=True, branch_tombstones=True)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["name"], "stale")
+        self.assertEqual(records[0]["project_id"], 7)
+        self.assertIn("_sdc_deleted_at", records[0])
+        self.assertEqual(list(state["bookmarks"]["branches"]["projects"]["7"]), ["main"])
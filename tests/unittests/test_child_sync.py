@@ -0,0 +1,289 @@
+import copy
+import threading
+import unittest
+from unittest.mock import patch
+
+from helpers import fake_api, get_stream, make_client
+from tap_gitlab.discover import discover
+from tap_gitlab.output import Checkpointer
+
+
+class ChildSyncTestCase(unittest.TestCase):
+    """Syncs three projects with two issues each against a fake API."""
+
+    def setUp(self):
+        self.catalog = discover()
+        self.last_activity = {}
+        self.archived = set()
+
+    def _make_client(self, max_workers, **config):
+        return make_client(projects="1 2 3", max_workers=max_workers, **config)
+
+    def _fake_get(self, endpoint, params, headers, path=None):
+        """Serve one project per ID and two issues per project."""
+        if endpoint.endswith("/issues"):
+            project_id = int(endpoint.split("/")[-2])
+            return [
+                {"id": project_id * 10 + i, "updated_at": f"2021-0{project_id}-0{i + 1}T00:00:00Z"}
+                for i in range(2)
+            ]
+        project_id = int(endpoint.rsplit("/", 1)[-1])
+        return {
+            "id": project_id,
+            "updated_at": "2021-01-01T00:00:00Z",
+            "last_activity_at": self.last_activity.get(project_id, "2021-01-01T00:00:00Z"),
+            "archived": project_id in self.archived,
+        }
+
+    def _sync(self, max_workers, state=None, **config):
+        client = self._make_client(max_workers, **config)
+        projects = get_stream(client, self.catalog, "projects")
+        projects.child_to_sync.append(get_stream(client, self.catalog, "issues"))
+
+        records = []
+        threads = set()
+
+        def capture(stream_name, record):
+            threads.add(threading.current_thread().name)
+            records.append((stream_name, record["id"]))
+
+        state = {} if state is None else state
+        with fake_api(self._fake_get, write_record=capture) as transformer:
+            projects.sync(state=state, transformer=transformer)
+
+        return records, threads, state
+
+
+class TestConcurrentChildSync(ChildSyncTestCase):
+
+    def test_children_run_inline_by_default(self):
+        records, threads, _ = self._sync(max_workers=1)
+        self.assertEqual(threads, {threading.current_thread().name})
+        self.assertEqual(len(records), 9)
+
+    def test_children_run_on_worker_threads(self):
+        records, threads, state = self._sync(max_workers=3)
+        self.assertTrue(any(name.startswith("projects-children") for name in threads))
+        self.assertEqual(
+            sorted(record_id for stream, record_id in records if stream == "issues"),
+            [10, 11, 20, 21, 30, 31],
+        )
+        self.assertEqual(state["bookmarks"]["issues"]["updated_at"], "2021-03-02T00:00:00Z")
+
+    def test_workers_do_not_share_schema_or_transformer(self):
+        client = self._make_client(max_workers=3)
+        projects = get_stream(client, self.catalog, "projects")
+        issues = get_stream(client, self.catalog, "issues")
+        projects.child_to_sync.append(issues)
+
+        used = []
+        transform_record = type(issues).transform_record
+
+        def record_use(stream, record, transformer):
+            used.append((stream.schema, transformer))
+            return transform_record(stream, record, transformer)
+
+        with fake_api(self._fake_get) as transformer, \
+                patch.object(type(issues), "transform_record", autospec=True, side_effect=record_use):
+            projects.sync(state={}, transformer=transformer)
+
+        # Two issues for each of the three projects, each project on its own schema copy and Transformer.
+        self.assertEqual(len(used), 6)
+        self.assertEqual(len({id(schema) for schema, _ in used}), 3)
+        self.assertEqual(len({id(worker) for _, worker in used}), 3)
+        self.assertTrue(all(schema is not issues.schema for schema, _ in used))
+        self.assertTrue(all(worker is not transformer for _, worker in used))
+
+    def test_worker_failure_is_raised(self):
+        client = self._make_client(max_workers=2)
+        projects = get_stream(client, self.catalog, "projects")
+        projects.child_to_sync.append(get_stream(client, self.catalog, "issues"))
+
+        def failing_get(endpoint, params, headers, path=None):
+            if endpoint.endswith("/issues"):
+                raise RuntimeError("boom")
+            return self._fake_get(endpoint, params, headers, path)
+
+        with fake_api(failing_get) as transformer:
+            with self.assertRaises(RuntimeError):
+                projects.sync(state={}, transformer=transformer)
+
+
+class TestPerProjectBookmarks(ChildSyncTestCase):
+
+    def test_each_project_gets_its_own_bookmark(self):
+        _, _, state = self._sync(max_workers=3)
+        self.assertEqual(
+            state["bookmarks"]["issues"]["projects"],
+            {"1": "2021-01-02T00:00:00Z", "2": "2021-02-02T00:00:00Z", "3": "2021-03-02T00:00:00Z"},
+        )
+
+    def test_projects_resume_from_their_own_bookmark(self):
+        state = {"bookmarks": {"issues": {
+            "updated_at": "2021-03-02T00:00:00Z",
+            "projects": {"1": "2021-01-02T00:00:00Z", "2": "2021-02-02T00:00:00Z"},
+        }}}
+        records, _, state = self._sync(max_workers=1, state=state)
+        # Project 3 is new and backfills from start_date; the others only re-read their last record.
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [11, 21, 30, 31])
+        self.assertEqual(state["bookmarks"]["issues"]["projects"]["3"], "2021-03-02T00:00:00Z")
+
+    def test_new_project_older_than_the_projects_bookmark_is_backfilled(self):
+        state = {"bookmarks": {
+            "projects": {"updated_at": "2021-06-01T00:00:00Z"},
+            "issues": {"projects": {"1": "2021-01-02T00:00:00Z", "3": "2021-03-02T00:00:00Z"}},
+        }}
+        records, _, state = self._sync(max_workers=1, state=state)
+        # No project is emitted again, but project 2 has never synced its issues.
+        self.assertEqual(sorted(records), [("issues", 20), ("issues", 21)])
+        self.assertEqual(state["bookmarks"]["issues"]["projects"]["2"], "2021-02-02T00:00:00Z")
+
+    def test_legacy_stream_bookmark_applies_to_every_project(self):
+        state = {"bookmarks": {"issues": {"updated_at": "2021-02-02T00:00:00Z"}}}
+        records, _, state = self._sync(max_workers=2, state=state)
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [21, 30, 31])
+        self.assertEqual(state["bookmarks"]["issues"]["projects"]["1"], "2021-02-02T00:00:00Z")
+        self.assertEqual(state["bookmarks"]["issues"]["updated_at"], "2021-03-02T00:00:00Z")
+
+
+class TestSkipInactiveProjects(ChildSyncTestCase):
+
+    def test_unchanged_projects_skip_their_children(self):
+        _, _, state = self._sync(max_workers=1, skip_inactive_projects=True)
+        self.assertEqual(len(state["bookmarks"]["projects"]["activity"]), 3)
+
+        self.last_activity[2] = "2021-06-01T00:00:00Z"
+        records, _, state = self._sync(max_workers=1, state=state, skip_inactive_projects=True)
+        # All projects are emitted, but only the active one re-reads its issues.
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "projects"), [1, 2, 3])
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [21])
+        self.assertEqual(
+            state["bookmarks"]["projects"]["activity"]["2"]["last_activity_at"], "2021-06-01T00:00:00Z"
+        )
+
+    def test_old_watermarks_are_refreshed(self):
+        _, _, state = self._sync(max_workers=1, skip_inactive_projects=True)
+        state["bookmarks"]["projects"]["activity"]["3"]["synced_at"] = "2021-01-01T00:00:00Z"
+        del state["bookmarks"]["projects"]["activity"]["1"]["synced_at"]
+
+        records, _, state = self._sync(max_workers=1, state=state, skip_inactive_projects=True)
+        # Project 3 was last synced too long ago, and project 1's watermark predates synced_at.
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [11, 31])
+        self.assertNotEqual(state["bookmarks"]["projects"]["activity"]["3"]["synced_at"], "2021-01-01T00:00:00Z")
+
+    def test_watermark_age_is_configurable(self):
+        _, _, state = self._sync(max_workers=1, skip_inactive_projects=True)
+        for watermark in state["bookmarks"]["projects"]["activity"].values():
+            watermark["synced_at"] = "2021-01-01T00:00:00Z"
+
+        records, _, state = self._sync(
+            max_workers=1, state=state, skip_inactive_projects=True, skip_inactive_max_age_hours=0
+        )
+        self.assertEqual([record_id for stream, record_id in records if stream == "issues"], [])
+
+    def test_children_are_synced_when_disabled(self):
+        _, _, state = self._sync(max_workers=1)
+        records, _, _ = self._sync(max_workers=1, state=state)
+        self.assertNotIn("activity", state["bookmarks"]["projects"])
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [11, 21, 31])
+
+    def test_archived_projects_skip_their_children(self):
+        self.archived = {1, 3}
+        records, _, _ = self._sync(max_workers=2, skip_archived_projects="true")
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "projects"), [1, 2, 3])
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [20, 21])
+
+
+class TestCheckpoints(ChildSyncTestCase):
+
+    def _sync_with_states(self, **config):
+        states = []
+        def capture(state):
+            states.append(copy.deepcopy(state))
+
+        with patch("tap_gitlab.output.write_state", side_effect=capture):
+            self._sync(max_workers=1, **config)
+        return states
+
+    def test_no_checkpoints_by_default(self):
+        self.assertEqual(self._sync_with_states(), [])
+
+    @patch("tap_gitlab.streams.issues.Issues.pagination", "keyset")
+    def test_ordered_streams_checkpoint_their_progress(self):
+        states = self._sync_with_states(checkpoint_records=1)
+        # Six issues and three projects, each followed by a checkpoint.
+        self.assertEqual(len(states), 9)
+        # After the first issue of project 1 only that issue's timestamp is safe to resume from.
+        self.assertEqual(states[0]["bookmarks"]["issues"]["projects"], {"1": "2021-01-01T00:00:00Z"})
+        self.assertEqual(states[-1]["bookmarks"]["issues"]["projects"]["3"], "2021-03-02T00:00:00Z")
+
+    def test_unordered_streams_only_checkpoint_finished_projects(self):
+        states = self._sync_with_states(checkpoint_records=1)
+        self.assertNotIn("issues", states[1].get("bookmarks", {}))
+        self.assertEqual(states[2]["bookmarks"]["issues"]["projects"], {"1": "2021-01-02T00:00:00Z"})
+
+
+class TestCheckpointer(unittest.TestCase):
+
+    def test_every_n_records(self):
+        checkpointer = Checkpointer(every_records=3)
+        self.assertEqual([checkpointer.due() for _ in range(7)], [False, False, True, False, False, True, False])
+
+    @patch("time.monotonic", side_effect=[0, 5, 11, 12])
+    def test_every_t_seconds(self, mock_monotonic):
+        checkpointer = Checkpointer(every_seconds=10)
+        self.assertEqual([checkpointer.due() for _ in range(3)], [False, True, False])
+
+
+class TestResumeInterruptedProjects(ChildSyncTestCase):
+
+    def test_interrupted_project_is_synced_first(self):
+        state = {"bookmarks": {"projects": {"in_progress": {"3": []}}}}
+        records, _, state = self._sync(max_workers=1, state=state)
+        self.assertEqual(
+            [record_id for stream, record_id in records if stream == "projects"], [3, 1, 2]
+        )
+        self.assertEqual([record_id for stream, record_id in records if stream == "issues"][:2], [30, 31])
+        self.assertNotIn("in_progress", state["bookmarks"]["projects"])
+
+    def test_finished_children_are_not_synced_again(self):
+        state = {"bookmarks": {"projects": {"in_progress": {"2": ["issues"]}}}}
+        records, _, _ = self._sync(max_workers=2, state=state)
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [10, 11, 30, 31])
+
+    def test_failed_project_stays_in_progress(self):
+        client = self._make_client(max_workers=1)
+        projects = get_stream(client, self.catalog, "projects")
+        projects.child_to_sync.append(get_stream(client, self.catalog, "issues"))
+
+        def failing_get(endpoint, params, headers, path=None):
+            if endpoint.endswith("/2/issues"):
+                raise RuntimeError("boom")
+            return self._fake_get(endpoint, params, headers, path)
+
+        state = {}
+        with fake_api(failing_get) as transformer:
+            with self.assertRaises(RuntimeError):
+                projects.sync(state=state, transformer=transformer)
+
+        self.assertEqual(state["bookmarks"]["projects"], {"in_progress": {"2": []}, "completed": ["1"]})
+
+    def test_completed_projects_are_skipped_on_resume(self):
+        state = {"bookmarks": {"projects": {"in_progress": {"2": []}, "completed": ["1"]}}}
+        records, _, state = self._sync(max_workers=2, state=state)
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "projects"), [1, 2, 3])
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [20, 21, 30, 31])
+        self.assertNotIn("completed", state["bookmarks"].get("projects", {}))
+
+    def test_parents_not_listed_again_are_dropped(self):
+        state = {"bookmarks": {"projects": {"in_progress": {"7": [], "2": []}}}}
+        records, _, state = self._sync(max_workers=1, state=state)
+        self.assertEqual([record_id for stream, record_id in records if stream == "projects"], [2, 1, 3])
+        self.assertNotIn("in_progress", state["bookmarks"].get("projects", {}))
+
+    def test_parents_with_skipped_children_are_dropped(self):
+        self.archived.add(2)
+        state = {"bookmarks": {"projects": {"in_progress": {"2": []}}}}
+        records, _, state = self._sync(max_workers=1, state=state, skip_archived_projects="true")
+        self.assertEqual(sorted(record_id for stream, record_id in records if stream == "issues"), [10, 11, 30, 31])
+        self.assertNotIn("in_progress", state["bookmarks"].get("projects", {}))
@@ -1,3 +1,5 @@
+import json
+import socket
 import unittest
 from unittest.mock import patch
 from datetime import datetime
@@ -14,6 +16,7 @@ class MockResponse:
         self.raise_error = raise_error
         self._json_data = json_data
         self.headers = headers or {}
+        self.content_consumed = False
 
     def raise_for_status(self):
         if self.raise_error:
@@ -21,8 +24,21 @@ class MockResponse:
         return self.status_code
 
     def json(self):
+        # Like requests, decoding reads the whole body, after which it cannot be streamed.
+        b"".join(self.iter_content(1024))
         return self._json_data
 
+    def iter_content(self, chunk_size=1):
+        if self.content_consumed:
+            raise requests.exceptions.StreamConsumedError()
+        self.content_consumed = True
+        body = json.dumps(self._json_data).encode("utf-8")
+        for i in range(0, len(body), chunk_size):
+            yield body[i:i + chunk_size]
+
+    def close(self):
+        pass
+
 
 def get_mock_response(status_code=200, json_data=None, raise_error=False, headers=None):
     return MockResponse(status_code, json_data or {}, raise_error, headers)
@@ -46,6 +62,17 @@ class TestClientRequests(unittest.TestCase):
             self.assertEqual(response, {"status": "ok"})
             mock_request.assert_called_once()
 
+    @patch("tap_gitlab.client.CHUNK_SIZE", 5)
+    @patch("tap_gitlab.client.Client.check_api_credentials")
+    @patch("tap_gitlab.client.Client.authenticate", return_value=({}, {}))
+    @patch("requests.Session.request", return_value=get_mock_response(200, [{"id": 1}, {"id": 2}]))
+    def test_get_iter_streams_array_elements(self, mock_request, mock_auth, mock_check_creds):
+        config = {"api_url": "https://gitlab.com/api/v4"}
+        with Client(config) as client:
+            records = client.get_iter(endpoint="https://gitlab.com/api/v4/projects", params={}, headers={})
+            self.assertEqual(list(records), [{"id": 1}, {"id": 2}])
+        self.assertTrue(mock_request.call_args[1]["stream"])
+
     @patch("time.sleep")
     @patch("tap_gitlab.client.Client.check_api_credentials")
     @patch("tap_gitlab.client.Client.authenticate", return_value=({}, {}))
@@ -164,6 +191,46 @@ class TestClientBaseUrl(unittest.TestCase):
         self.assertEqual(client.base_url, "https://gitlab.mycompany.com/api/v4")
 
 
+class TestClientSession(unittest.TestCase):
+
+    def test_pool_is_sized_for_concurrency(self):
+        """The per-host pool must hold one connection per worker and prefetch thread."""
+        client = Client({"private_token": "dummy_token", "max_workers": 4, "prefetch_pages": 5})
+        adapter = client._session.get_adapter(client.base_url)
+        self.assertEqual(adapter._pool_maxsize, 20)
+
+    def test_defaults_keep_requests_behaviour(self):
+        client = Client({"private_token": "dummy_token"})
+        adapter = client._session.get_adapter(client.base_url)
+        self.assertEqual(adapter._pool_maxsize, 10)
+        self.assertEqual(adapter.max_retries.total, 0)
+        self.assertIs(adapter.max_retries.read, False)
+        self.assertEqual(client._session.headers["Accept-Encoding"], "gzip, deflate")
+
+    def test_read_timeout_is_not_a_connection_error(self):
+        client = Client({"private_token": "dummy_token"})
+        with socket.socket() as server:
+            # Accepts the connection but never answers.
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+            with self.assertRaises(requests.exceptions.ReadTimeout):
+                client._session.get(f"http://127.0.0.1:{server.getsockname()[1]}/user", timeout=0.2)
+
+    def test_http_options_from_config(self):
+        client = Client({
+            "private_token": "dummy_token",
+            "pool_maxsize": 50,
+            "accept_encoding": "identity",
+            "connect_retries": 3,
+            "read_retries": 2,
+        })
+        adapter = client._session.get_adapter(client.base_url)
+        self.assertEqual(adapter._pool_maxsize, 50)
+        self.assertEqual(adapter.max_retries.connect, 3)
+        self.assertEqual(adapter.max_retries.read, 2)
+        self.assertEqual(client._session.headers["Accept-Encoding"], "identity")
+
+
 class TestCheckApiCredentials(unittest.TestCase):
 
     @patch("requests.Session.get", side_effect=ConnectionError("Failed to resolve 'test.gitlab.com'"))
@@ -235,3 +302,67 @@ class TestAuthenticate(unittest.TestCase):
         sent_params = call_kwargs.get("params", {})
         self.assertEqual(sent_headers.get("PRIVATE-TOKEN"), "secret_token")
         self.assertNotIn("private_token", sent_params)
+
+
+class TestPaginate(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client({"private_token": "dummy_token"})
+
+    def _serve(self, pages):
+        """Serve `pages` as (records, headers) tuples in order through Client.get."""
+        responses = iter(pages)
+
+        def fake_get(endpoint, params, headers, path=None):
+            records, response_headers = next(responses)
+            self.client.last_response_headers = response_headers
+            return records
+
+        return patch.object(self.client, "get", side_effect=fake_get)
+
+    def test_is_lazy_and_follows_x_next_page(self):
+        with self._serve([([{"id": 1}], {"X-Next-Page": "2"}), ([{"id": 2}], {})]) as mock_get:
+            records = self.client.paginate(path="/projects/1/users")
+            mock_get.assert_not_called()
+            self.assertEqual(list(records), [{"id": 1}, {"id": 2}])
+        self.assertEqual(mock_get.call_args_list[0][0][0], "https://gitlab.com/api/v4/projects/1/users")
+        self.assertEqual(mock_get.call_args_list[1][0][1]["page"], 2)
+
+    def test_path_is_the_first_positional_parameter(self):
+        with self._serve([([{"id": 1}], {})]) as mock_get:
+            self.assertEqual(list(self.client.paginate("/projects")), [{"id": 1}])
+        self.assertEqual(mock_get.call_args_list[0][0][0], "https://gitlab.com/api/v4/projects")
+
+    def test_non_list_response_is_one_record(self):
+        with self._serve([({"id": 1, "name": "project"}, {})]):
+            self.assertEqual(list(self.client.paginate("/projects/1")), [{"id": 1, "name": "project"}])
+
+    def test_follows_next_link(self):
+        next_url = "https://gitlab.com/api/v4/projects?id_after=1&pagination=keyset"
+        with self._serve([
+            ([{"id": 1}], {"Link": f'<{next_url}>; rel="next"'}),
+            ([{"id": 2}], {}),
+        ]) as mock_get:
+            records = list(self.client.paginate(path="projects", params={"pagination": "keyset"}))
+        self.assertEqual(records, [{"id": 1}, {"id": 2}])
+        self.assertEqual(mock_get.call_args_list[1][0][:2], (next_url, {}))
+
+    def test_prefetches_pages_in_order_when_total_is_known(self):
+        self.client.prefetch_pages = 3
+
+        def fake_get(endpoint, params, headers, path=None):
+            self.client.last_response_headers = {"X-Next-Page": "2", "X-Total-Pages": "5"}
+            return [{"id": params["page"] * 10 + i} for i in range(2)]
+
+        with patch.object(self.client, "get", side_effect=fake_get) as mock_get:
+            ids = [r["id"] for r in self.client.paginate(path="projects/1/users", page_size=2)]
+        self.assertEqual(ids, [10, 11, 20, 21, 30, 31, 40, 41, 50, 51])
+        requested_pages = sorted(call[0][1]["page"] for call in mock_get.call_args_list)
+        self.assertEqual(requested_pages, [1, 2, 3, 4, 5])
+
+    @patch("time.sleep")
+    @patch("requests.Session.request")
+    def test_retries_failed_pages(self, mock_request, mock_sleep):
+        mock_request.side_effect = [ConnectionError, get_mock_response(200, [{"id": 1}])]
+        self.assertEqual(list(self.client.paginate(path="projects")), [{"id": 1}])
+        self.assertEqual(mock_request.call_count, 2)
@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from tap_gitlab.client import Client
+from tap_gitlab.credentials_cache import CredentialsCache, credentials_key
+from tap_gitlab.exceptions import UnauthorizedError
+
+
+class TestCredentialsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "credentials.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_recorded_key_is_verified_until_it_expires(self):
+        cache = CredentialsCache(self.path, ttl_seconds=60)
+        key = credentials_key("https://gitlab.com/api/v4", "secret")
+        self.assertFalse(cache.is_verified(key))
+
+        cache.record(key)
+        self.assertTrue(cache.is_verified(key))
+        with patch("time.time", return_value=time.time() + 61):
+            self.assertFalse(cache.is_verified(key))
+
+    def test_file_does_not_contain_the_token(self):
+        CredentialsCache(self.path).record(credentials_key("https://gitlab.com/api/v4", "secret"))
+        with open(self.path) as file:
+            self.assertNotIn("secret", file.read())
+        self.assertEqual(os.stat(self.path).st_mode & 0o777, 0o600)
+
+    def test_corrupt_file_is_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as file:
+            file.write("not json")
+        cache = CredentialsCache(self.path)
+        self.assertFalse(cache.is_verified("key"))
+        cache.record("key")
+        self.assertTrue(cache.is_verified("key"))
+
+    def test_expired_entries_are_dropped(self):
+        cache = CredentialsCache(self.path, ttl_seconds=60)
+        cache.record("old")
+        with patch("time.time", return_value=time.time() + 61):
+            cache.record("new")
+        with open(self.path) as file:
+            self.assertEqual(list(json.load(file)), ["new"])
+
+
+@patch("tap_gitlab.client.Client.check_api_credentials")
+class TestVerifyCredentials(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "credentials.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _client(self, **config):
+        return Client(dict({"private_token": "secret"}, **config))
+
+    def test_checks_every_time_without_a_cache(self, mock_check):
+        self._client().verify_credentials()
+        self._client().verify_credentials()
+        self.assertEqual(mock_check.call_count, 2)
+
+    def test_recent_check_is_reused(self, mock_check):
+        with self._client(credentials_cache_path=self.path):
+            pass
+        with self._client(credentials_cache_path=self.path):
+            pass
+        self.assertEqual(mock_check.call_count, 1)
+
+    def test_other_token_or_host_is_checked(self, mock_check):
+        self._client(credentials_cache_path=self.path).verify_credentials()
+        self._client(credentials_cache_path=self.path, private_token="other").verify_credentials()
+        self._client(credentials_cache_path=self.path, api_url="https://gitlab.example.com").verify_credentials()
+        self.assertEqual(mock_check.call_count, 3)
+
+    def test_ttl_is_configurable(self, mock_check):
+        self._client(credentials_cache_path=self.path, credentials_cache_ttl="10").verify_credentials()
+        with patch("time.time", return_value=time.time() + 11):
+            self._client(credentials_cache_path=self.path).verify_credentials()
+        self.assertEqual(mock_check.call_count, 2)
+
+    def test_failed_check_is_not_recorded(self, mock_check):
+        mock_check.side_effect = UnauthorizedError("401")
+        with self.assertRaises(UnauthorizedError):
+            self._client(credentials_cache_path=self.path).verify_credentials()
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1,76 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tap_gitlab import discover as discover_module, main
+from tap_gitlab.discover import build_catalog, discover, load_catalog
+from tap_gitlab.streams.issues import Issues
+from tap_gitlab.streams.users import Users
+
+
+class TestPrecompiledCatalog(unittest.TestCase):
+
+    def test_precompiled_catalog_is_up_to_date(self):
+        self.assertEqual(
+            load_catalog(), json.loads(json.dumps(build_catalog().to_dict())),
+            "tap_gitlab/catalog.json is stale, regenerate it with `python -m tap_gitlab.discover`",
+        )
+
+    def test_missing_precompiled_catalog_is_built(self):
+        with patch.object(discover_module, "CATALOG_PATH", "/nonexistent/catalog.json"):
+            self.assertEqual(discover().to_dict(), build_catalog().to_dict())
+
+    def test_each_discover_returns_a_new_catalog(self):
+        catalog = discover()
+        catalog.get_stream("issues").metadata[0]["metadata"]["selected"] = True
+        self.assertNotIn("selected", discover().get_stream("issues").metadata[0]["metadata"])
+
+    def test_import_does_not_load_streams(self):
+        modules = subprocess.check_output(
+            [sys.executable, "-c", "import sys, tap_gitlab; print(' '.join(sys.modules))"], text=True
+        ).split()
+        self.assertNotIn("tap_gitlab.streams", modules)
+        self.assertNotIn("tap_gitlab.client", modules)
+        self.assertNotIn("aiohttp", modules)
+
+
+class TestDiscoverMode(unittest.TestCase):
+
+    @patch("requests.Session.request", side_effect=AssertionError("discovery must not make requests"))
+    @patch("requests.Session.get", side_effect=AssertionError("discovery must not make requests"))
+    def test_discover_makes_no_requests(self, mock_get, mock_request):
+        config = {"private_token": "t", "start_date": "2021-01-01T00:00:00Z", "groups": "", "projects": "1"}
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = os.path.join(tmp, "config.json")
+            with open(config_path, "w") as file:
+                json.dump(config, file)
+            with patch.object(sys, "argv", ["tap-gitlab", "--config", config_path, "--discover"]), \
+                    patch("sys.stdout", new_callable=io.StringIO) as stdout:
+                main()
+
+        self.assertEqual(json.loads(stdout.getvalue()), load_catalog())
+        mock_get.assert_not_called()
+        mock_request.assert_not_called()
+
+
+class TestSchemaDict(unittest.TestCase):
+
+    def test_streams_get_their_own_schema(self):
+        catalog_entry = discover().get_stream("issues")
+        first = Issues(catalog=catalog_entry)
+        second = Issues(catalog=catalog_entry)
+        self.assertIsNot(first.schema, second.schema)
+        self.assertEqual(first.schema, second.schema)
+        self.assertFalse(any(name.startswith("_") for name in vars(catalog_entry)))
+
+    def test_entries_are_converted_separately(self):
+        catalog = discover()
+        self.assertNotEqual(
+            Issues(catalog=catalog.get_stream("issues")).schema,
+            Users(catalog=catalog.get_stream("users")).schema,
+        )
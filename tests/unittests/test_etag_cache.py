@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tap_gitlab.client import Client
+from tap_gitlab.etag_cache import ETagCache
+
+
+class MockResponse:
+
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self.text = json.dumps(body) if body is not None else ""
+        self.headers = {"ETag": etag} if etag else {}
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class TestETagCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "cache", "etags.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_persists_across_instances(self):
+        cache = ETagCache(self.path)
+        cache.put("https://gitlab.com/api/v4/projects/1", 'W/"abc"', '{"id": 1}')
+        cache.close()
+
+        cache = ETagCache(self.path)
+        self.assertEqual(cache.get("https://gitlab.com/api/v4/projects/1"), ('W/"abc"', '{"id": 1}'))
+        self.assertIsNone(cache.get("https://gitlab.com/api/v4/projects/2"))
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = ETagCache(self.path, max_bytes=20)
+        with patch("time.time", side_effect=[1, 2, 3, 4]):
+            cache.put("a", "1", "x" * 8)
+            cache.put("b", "2", "y" * 8)
+            cache.get("a")
+            cache.put("c", "3", "z" * 8)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        cache.close()
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = Client({
+            "private_token": "dummy_token",
+            "etag_cache_path": os.path.join(self.tmp.name, "etags.db"),
+        })
+        self.url = "https://gitlab.com/api/v4/projects/1"
+
+    def tearDown(self):
+        self.client.etag_cache.close()
+        self.tmp.cleanup()
+
+    @patch("requests.Session.request")
+    def test_not_modified_is_served_from_cache(self, mock_request):
+        mock_request.side_effect = [MockResponse(200, {"id": 1}, etag='W/"v1"'), MockResponse(304)]
+
+        self.assertEqual(self.client.get_cached(self.url, {}, {}), {"id": 1})
+        self.assertNotIn("If-None-Match", mock_request.call_args_list[0][1]["headers"])
+
+        self.assertEqual(self.client.get_cached(self.url, {}, {}), {"id": 1})
+        self.assertEqual(mock_request.call_args_list[1][1]["headers"]["If-None-Match"], 'W/"v1"')
+        self.assertEqual(self.client.etag_cache.hits, 1)
+
+    @patch("requests.Session.request")
+    def test_changed_entity_replaces_cached_body(self, mock_request):
+        mock_request.side_effect = [
+            MockResponse(200, {"id": 1, "name": "old"}, etag='W/"v1"'),
+            MockResponse(200, {"id": 1, "name": "new"}, etag='W/"v2"'),
+        ]
+        self.client.get_cached(self.url, {}, {})
+        self.assertEqual(self.client.get_cached(self.url, {}, {})["name"], "new")
+        self.assertEqual(self.client.etag_cache.get(self.url)[0], 'W/"v2"')
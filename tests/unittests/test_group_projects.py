@@ -0,0 +1,100 @@
+import unittest
+
+from helpers import BASE_URL, fake_api, get_stream, make_client, select
+from tap_gitlab.discover import discover
+
+
+class TestGroupProjects(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = discover()
+        self.requests = []
+
+    def fake_get(self, endpoint, params, headers, path=None):
+        self.requests.append((endpoint, dict(params)))
+        if endpoint == f"{BASE_URL}/groups/9":
+            return {"id": 9, "name": "group"}
+        if endpoint == f"{BASE_URL}/groups/9/projects":
+            return [
+                {"id": 1, "path_with_namespace": "group/one", "updated_at": "2021-01-01T00:00:00Z"},
+                {"id": 2, "path_with_namespace": "group/two", "updated_at": "2021-01-01T00:00:00Z"},
+            ]
+        project_id = endpoint.rsplit("/", 1)[-1]
+        return {"id": int(project_id), "updated_at": "2021-01-01T00:00:00Z"}
+
+    def _sync(self, config, deselected_group_fields=(), state=None):
+        select(self.catalog.get_stream("projects"))
+        groups = get_stream(make_client(groups="9", **config), self.catalog, "groups", deselected=deselected_group_fields)
+
+        records = []
+        with fake_api(self.fake_get, write_record=lambda name, rec: records.append((name, rec["id"]))) as transformer:
+            groups.sync(state=state or {}, transformer=transformer, streams_to_sync=["groups", "projects"], catalog=self.catalog)
+        return records
+
+    def test_group_projects_are_listed_without_per_project_requests(self):
+        records = self._sync({"projects": "2 group%2Fone 5"})
+        self.assertEqual(records, [("groups", 9), ("projects", 1), ("projects", 2), ("projects", 5)])
+        self.assertEqual(
+            [endpoint for endpoint, _ in self.requests],
+            [f"{BASE_URL}/groups/9", f"{BASE_URL}/groups/9/projects", f"{BASE_URL}/projects/5"],
+        )
+
+    def test_listing_options(self):
+        self._sync({"include_subgroups": "true"})
+        listing_params = self.requests[1][1]
+        self.assertEqual(listing_params["include_subgroups"], "true")
+        self.assertEqual(listing_params["with_shared"], "false")
+        self.assertEqual(listing_params["pagination"], "keyset")
+
+    def test_embedded_projects_are_only_requested_when_selected(self):
+        self._sync({})
+        self.assertNotIn("with_projects", self.requests[0][1])
+
+        self.requests.clear()
+        self._sync({}, deselected_group_fields=["projects"])
+        self.assertEqual(self.requests[0][1]["with_projects"], "false")
+
+    def test_project_requests_do_not_carry_the_bookmark(self):
+        state = {"bookmarks": {"projects": {"updated_at": "2020-06-01T00:00:00Z"}}}
+        self._sync({"projects": "5"}, state=state)
+        self.assertEqual(self.requests[1][1]["updated_since"], "2020-06-01T00:00:00Z")
+        self.assertEqual(self.requests[2][0], f"{BASE_URL}/projects/5")
+        self.assertNotIn("updated_since", self.requests[2][1])
+
+    def test_group_listing_is_not_filtered_when_children_are_selected(self):
+        client = make_client(groups="9")
+        projects = get_stream(client, self.catalog, "projects")
+        projects.child_to_sync.append(get_stream(client, self.catalog, "issues"))
+        projects.start_sync({"bookmarks": {"projects": {"updated_at": "2020-06-01T00:00:00Z"}}})
+        with fake_api(self.fake_get):
+            self.assertEqual(len(list(projects.get_group_projects(9))), 2)
+        self.assertNotIn("updated_since", self.requests[0][1])
+        self.assertEqual(projects.params["updated_since"], "2020-06-01T00:00:00Z")
+
+    def test_every_listing_page_is_read_with_inline_child_streams(self):
+        client = make_client(groups="9")
+        next_link = f'<{BASE_URL}/groups/9/projects?page_token=2>; rel="next"'
+
+        def paged_get(endpoint, params, headers, path=None):
+            self.requests.append((endpoint, dict(params)))
+            client.last_response_headers = {}
+            if endpoint == f"{BASE_URL}/groups/9":
+                return {"id": 9, "name": "group"}
+            if endpoint == f"{BASE_URL}/groups/9/projects":
+                client.last_response_headers = {"Link": next_link}
+                return [{"id": 1, "path_with_namespace": "group/one", "updated_at": "2021-01-01T00:00:00Z"}]
+            if endpoint == f"{BASE_URL}/groups/9/projects?page_token=2":
+                return [{"id": 2, "path_with_namespace": "group/two", "updated_at": "2021-01-01T00:00:00Z"}]
+            return []
+
+        select(self.catalog.get_stream("projects"))
+        select(self.catalog.get_stream("issues"))
+        groups = get_stream(client, self.catalog, "groups")
+        records = []
+        with fake_api(paged_get, write_record=lambda name, rec: records.append((name, rec["id"]))) as transformer:
+            groups.sync(
+                state={}, transformer=transformer, streams_to_sync=["groups", "projects", "issues"], catalog=self.catalog
+            )
+
+        self.assertEqual(records, [("groups", 9), ("projects", 1), ("projects", 2)])
+        self.assertIn(f"{BASE_URL}/groups/9/projects?page_token=2", [endpoint for endpoint, _ in self.requests])
@@ -0,0 +1,41 @@
+import json
+import unittest
+
+from tap_gitlab.json_stream import decode_chunks, iter_json_array
+
+
+def split(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIterJsonArray(unittest.TestCase):
+
+    records = [
+        {"id": 1, "title": "café ☃", "labels": ["a", "b"], "nested": {"x": [1, 2, {"y": None}]}},
+        {"id": 22, "description_html": "<p>" + "x" * 500 + "</p>", "weight": 1.5},
+        {"id": 333, "closed": False, "text": "brackets ] and , in strings"},
+    ]
+
+    def test_matches_json_loads_for_any_chunk_size(self):
+        text = json.dumps(self.records, indent=1)
+        for size in (1, 2, 7, 64, len(text)):
+            with self.subTest(chunk_size=size):
+                self.assertEqual(list(iter_json_array(split(text, size))), self.records)
+
+    def test_numbers_split_across_chunks(self):
+        self.assertEqual(list(iter_json_array(["[12", "34, 5", "6]"])), [1234, 56])
+
+    def test_empty_array(self):
+        self.assertEqual(list(iter_json_array(["  [ ", " ] "])), [])
+
+    def test_non_array_document_is_yielded_whole(self):
+        self.assertEqual(list(iter_json_array(['{"id":', ' 1}'])), [{"id": 1}])
+
+    def test_truncated_body_raises(self):
+        with self.assertRaises(ValueError):
+            list(iter_json_array(['[{"id": 1}, {"id"']))
+
+    def test_multibyte_characters_split_across_byte_chunks(self):
+        body = json.dumps(self.records, ensure_ascii=False).encode("utf-8")
+        chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+        self.assertEqual(list(iter_json_array(decode_chunks(chunks))), self.records)
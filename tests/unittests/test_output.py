@@ -0,0 +1,69 @@
+import io
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from tap_gitlab import output
+
+
+class FakeStdout(io.TextIOWrapper):
+    def __init__(self):
+        super().__init__(io.BytesIO(), encoding="utf-8")
+
+    def lines(self):
+        self.flush()
+        return [json.loads(line) for line in self.buffer.getvalue().decode("utf-8").splitlines()]
+
+
+class TestOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.stdout = FakeStdout()
+        patcher = patch("sys.stdout", self.stdout)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_are_buffered_until_state(self):
+        output.write_schema("issues", {"type": "object"}, ["id"])
+        output.write_record("issues", {"id": 1, "title": "café"})
+        self.assertEqual(self.stdout.lines(), [])
+
+        output.write_state({"bookmarks": {"issues": {"updated_at": "2021-01-01T00:00:00Z"}}})
+        self.assertEqual(self.stdout.lines(), [
+            {"type": "SCHEMA", "stream": "issues", "schema": {"type": "object"}, "key_properties": ["id"]},
+            {"type": "RECORD", "stream": "issues", "record": {"id": 1, "title": "café"}},
+            {"type": "STATE", "value": {"bookmarks": {"issues": {"updated_at": "2021-01-01T00:00:00Z"}}}},
+        ])
+
+    @patch("tap_gitlab.output.BUFFER_SIZE", 64)
+    def test_full_buffer_is_flushed(self):
+        for record_id in range(5):
+            output.write_record("issues", {"id": record_id})
+        self.assertGreater(len(self.stdout.lines()), 0)
+        output.flush()
+        self.assertEqual(len(self.stdout.lines()), 5)
+
+    def test_decimals_keep_their_precision(self):
+        line = output.encode_message({"type": "RECORD", "record": {"weight": Decimal("0.10000000000000000001")}})
+        self.assertEqual(line, b'{"type": "RECORD", "record": {"weight": 0.10000000000000000001}}\n')
+
+    @patch("tap_gitlab.output.orjson", None)
+    def test_stdlib_fallback(self):
+        self.assertEqual(output.encode_message({"type": "STATE", "value": {}}), b'{"type": "STATE", "value": {}}\n')
+
+    def test_nan_is_refused(self):
+        encoders = {"simplejson": None}
+        if output.orjson is not None:
+            encoders["orjson"] = output.orjson
+        for name, encoder in encoders.items():
+            for value in (float("nan"), float("inf"), [float("-inf")]):
+                with self.subTest(encoder=name, value=value), patch("tap_gitlab.output.orjson", encoder):
+                    with self.assertRaises(ValueError):
+                        output.encode_message({"type": "RECORD", "record": {"weight": value, "label": None}})
+
+    def test_nulls_are_encoded(self):
+        self.assertEqual(
+            json.loads(output.encode_message({"type": "RECORD", "record": {"weight": None, "tags": [None]}})),
+            {"type": "RECORD", "record": {"weight": None, "tags": [None]}},
+        )
@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import patch
+
+from tap_gitlab.rate_limiter import RateLimiter
+
+NOW = 1_700_000_000
+
+
+def headers(remaining, limit=100, reset=NOW + 30):
+    return {
+        "RateLimit-Limit": str(limit),
+        "RateLimit-Remaining": str(remaining),
+        "RateLimit-Reset": str(reset),
+    }
+
+
+@patch("time.time", return_value=NOW)
+@patch("time.sleep")
+class TestRateLimiter(unittest.TestCase):
+
+    def test_no_headers_never_waits(self, mock_sleep, mock_time):
+        limiter = RateLimiter()
+        limiter.update({})
+        self.assertEqual(limiter.acquire(), 0.0)
+        mock_sleep.assert_not_called()
+
+    def test_healthy_budget_does_not_wait(self, mock_sleep, mock_time):
+        limiter = RateLimiter()
+        limiter.update(headers(remaining=80))
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.tokens, 79)
+        mock_sleep.assert_not_called()
+
+    def test_low_budget_is_spread_until_reset(self, mock_sleep, mock_time):
+        limiter = RateLimiter(reserve=1)
+        limiter.update(headers(remaining=7))
+        self.assertAlmostEqual(limiter.acquire(), 30 / 6)
+        mock_sleep.assert_called_once_with(30 / 6)
+
+    def test_empty_bucket_waits_for_reset(self, mock_sleep, mock_time):
+        limiter = RateLimiter(reserve=1)
+        limiter.update(headers(remaining=1))
+        self.assertEqual(limiter.acquire(), 30)
+        self.assertEqual(limiter.tokens, 99)
+        self.assertEqual(limiter.throttled_seconds, 30)
+
+    def test_window_rollover_refills_bucket(self, mock_sleep, mock_time):
+        limiter = RateLimiter()
+        limiter.update(headers(remaining=0, reset=NOW - 1))
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.tokens, 99)
+        mock_sleep.assert_not_called()
@@ -0,0 +1,98 @@
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from tap_gitlab.client import Client
+from tap_gitlab.request_stats import RequestStats, endpoint_template, stream_context
+
+
+def get_mock_response(status_code, body):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = body
+    response._content_consumed = True
+    return response
+
+
+class TestEndpointTemplate(unittest.TestCase):
+
+    def test_ids_are_replaced(self):
+        self.assertEqual(
+            endpoint_template("https://gitlab.com/api/v4/projects/42/issues?page=3"), "projects/{id}/issues"
+        )
+
+    def test_url_encoded_paths_are_replaced(self):
+        self.assertEqual(
+            endpoint_template("https://gitlab.com/api/v4/groups/my-group%2Fsub/milestones"),
+            "groups/{id}/milestones",
+        )
+
+    def test_collection_endpoint_is_kept(self):
+        self.assertEqual(endpoint_template("https://gitlab.com/api/v4/projects"), "projects")
+
+
+class TestRequestStats(unittest.TestCase):
+
+    def test_requests_are_grouped_by_stream_and_template(self):
+        stats = RequestStats()
+        with stream_context("issues"):
+            stats.record_request("https://gitlab.com/api/v4/projects/1/issues", 0.02, 200, 100)
+            stats.record_request("https://gitlab.com/api/v4/projects/2/issues", 0.3, 200, 50)
+        stats.record_request("https://gitlab.com/api/v4/projects/1/issues", 0.02, 200, 10)
+
+        issues = stats._stats[("issues", "projects/{id}/issues")]
+        self.assertEqual(issues.requests, 2)
+        self.assertEqual(issues.response_bytes, 150)
+        self.assertEqual(stats._stats[("-", "projects/{id}/issues")].requests, 1)
+
+    def test_percentiles_use_bucket_upper_bounds(self):
+        stats = RequestStats()
+        for _ in range(9):
+            stats.record_request("https://gitlab.com/api/v4/projects", 0.02, 200, 0)
+        stats.record_request("https://gitlab.com/api/v4/projects", 4.0, 200, 0)
+
+        projects = stats._stats[("-", "projects")]
+        self.assertEqual(projects.percentile(50), 0.025)
+        self.assertEqual(projects.percentile(90), 0.025)
+        self.assertEqual(projects.percentile(99), 5.0)
+
+    def test_log_summary(self):
+        stats = RequestStats()
+        stats.record_request("https://gitlab.com/api/v4/projects", 0.02, 429, 0)
+        stats.record_backoff("https://gitlab.com/api/v4/projects", 1.5)
+        with self.assertLogs(level="INFO") as logs:
+            stats.log_summary()
+        self.assertIn("endpoint: projects, requests: 1", logs.output[0])
+        self.assertIn("retries: 1, rate_limited: 1, backoff: 1.5s", logs.output[0])
+
+
+class TestClientRequestStats(unittest.TestCase):
+
+    @patch("time.sleep")
+    @patch("tap_gitlab.client.Client.check_api_credentials")
+    @patch("tap_gitlab.client.Client.authenticate", return_value=({}, {}))
+    @patch("requests.Session.request")
+    def test_rate_limited_requests_and_retries_are_counted(self, mock_request, mock_auth, mock_check_creds, mock_sleep):
+        mock_request.side_effect = [
+            get_mock_response(429, b"{}"),
+            get_mock_response(429, b"{}"),
+            get_mock_response(200, b"[]"),
+        ]
+        with Client({"api_url": "https://gitlab.com/api/v4"}) as client:
+            client.get(endpoint="https://gitlab.com/api/v4/projects/7/users", params={}, headers={})
+
+        stats = client.request_stats._stats[("-", "projects/{id}/users")]
+        self.assertEqual(stats.requests, 3)
+        self.assertEqual(stats.rate_limited, 2)
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.response_bytes, 6)
+
+    @patch("tap_gitlab.client.Client.check_api_credentials")
+    @patch("tap_gitlab.client.Client.authenticate", return_value=({}, {}))
+    @patch("requests.Session.request", return_value=get_mock_response(200, b'[{"id": 1}]'))
+    def test_streamed_bytes_are_counted_while_reading(self, mock_request, mock_auth, mock_check_creds):
+        with Client({"api_url": "https://gitlab.com/api/v4"}) as client:
+            list(client.get_iter(endpoint="https://gitlab.com/api/v4/projects", params={}, headers={}))
+
+        self.assertEqual(client.request_stats._stats[("-", "projects")].response_bytes, 11)
@@ -0,0 +1,117 @@
+import unittest
+from unittest.mock import patch
+
+from tap_gitlab.client import Client
+from tap_gitlab.exceptions import BadRequestError, MethodNotAllowedError
+from tap_gitlab.streams.commits import Commits
+from tap_gitlab.streams.issues import Issues
+from tap_gitlab.streams.project_milestones import ProjectMilestones
+
+COMMITS_URL = "https://gitlab.com/api/v4/projects/1/repository/commits"
+
+
+def serve_pages(client, pages):
+    """Patch `client.get` to serve `pages` as (records, headers) tuples in order."""
+    responses = iter(pages)
+
+    def fake_get(endpoint, params, headers, path=None):
+        records, response_headers = next(responses)
+        if isinstance(records, Exception):
+            raise records
+        client.last_response_headers = response_headers
+        return records
+
+    return patch.object(client, "get", side_effect=fake_get)
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.client = Client({"private_token": "dummy_token"})
+        self.stream = Commits(self.client)
+        self.stream.url_endpoint = COMMITS_URL
+
+    def test_follows_next_link(self):
+        next_url = f"{COMMITS_URL}?id_after=1&pagination=keyset"
+        with serve_pages(self.client, [
+            ([{"id": 1}], {"Link": f'<{next_url}>; rel="next"'}),
+            ([{"id": 2}], {}),
+        ]) as mock_get:
+            self.assertEqual([r["id"] for r in self.stream.get_records()], [1, 2])
+
+        first_params = mock_get.call_args_list[0][0][1]
+        self.assertEqual(first_params["pagination"], "keyset")
+        self.assertEqual(first_params["order_by"], "id")
+        self.assertNotIn("page", first_params)
+        self.assertEqual(mock_get.call_args_list[1][0][0], next_url)
+
+    def test_falls_back_to_offset_when_rejected(self):
+        with serve_pages(self.client, [
+            (BadRequestError("order_by does not have a valid value"), {}),
+            ([{"id": 1}], {"X-Next-Page": "2"}),
+            ([{"id": 2}], {}),
+            ([{"id": 3}], {}),
+        ]) as mock_get:
+            self.assertEqual([r["id"] for r in self.stream.get_records()], [1, 2])
+            self.assertTrue(self.stream.keyset_unsupported.is_set())
+            self.assertNotIn("pagination", mock_get.call_args_list[1][0][1])
+
+            # Later syncs of the same stream go straight to offset pagination.
+            self.assertEqual([r["id"] for r in self.stream.get_records()], [3])
+            self.assertEqual(mock_get.call_count, 4)
+
+
+class TestIncrementalParam(unittest.TestCase):
+
+    def test_commits_filter_with_since(self):
+        client = Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z"})
+        stream = Commits(client)
+        stream.start_sync({"bookmarks": {"commits": {"committed_date": "2021-05-01T00:00:00Z"}}}, {"id": 1})
+        self.assertEqual(stream.params, {"since": "2021-05-01T00:00:00Z"})
+        self.assertEqual(stream.url_endpoint, COMMITS_URL)
+
+    def test_milestones_filter_with_updated_after(self):
+        client = Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z"})
+        stream = ProjectMilestones(client)
+        stream.start_sync({}, {"id": 1})
+        self.assertEqual(stream.params, {"updated_after": "2020-01-01T00:00:00Z"})
+        self.assertFalse(stream.reads_in_bookmark_order)
+
+    def test_issues_are_read_from_offset_pages_in_updated_at_order(self):
+        client = Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z"})
+        stream = Issues(client)
+        stream.start_sync({}, {"id": 1})
+        with serve_pages(client, [([{"id": 1}], {})]) as mock_get:
+            self.assertEqual([r["id"] for r in stream.get_records()], [1])
+
+        mock_get.assert_called_once()
+        params = mock_get.call_args[0][1]
+        self.assertNotIn("pagination", params)
+        self.assertEqual(params["updated_after"], "2020-01-01T00:00:00Z")
+        self.assertEqual((params["order_by"], params["sort"]), ("updated_at", "asc"))
+        # Offset pages can shift while issues are updated, so the order is not relied on for checkpoints.
+        self.assertFalse(stream.reads_in_bookmark_order)
+
+    @patch.object(Issues, "pagination", "keyset")
+    def test_issues_keep_their_order_after_a_keyset_rejection(self):
+        client = Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z"})
+        stream = Issues(client)
+        stream.start_sync({}, {"id": 1})
+        with serve_pages(client, [
+            (MethodNotAllowedError("405 Method Not Allowed"), {}),
+            ([{"id": 1}], {}),
+        ]) as mock_get:
+            self.assertEqual([r["id"] for r in stream.get_records()], [1])
+
+        offset_params = mock_get.call_args_list[1][0][1]
+        self.assertNotIn("pagination", offset_params)
+        self.assertEqual(offset_params["updated_after"], "2020-01-01T00:00:00Z")
+        self.assertEqual((offset_params["order_by"], offset_params["sort"]), ("updated_at", "asc"))
+
+    def test_other_offset_reads_are_not_reordered(self):
+        client = Client({"private_token": "dummy_token", "start_date": "2020-01-01T00:00:00Z"})
+        stream = ProjectMilestones(client)
+        stream.start_sync({}, {"id": 1})
+        with serve_pages(client, [([{"id": 1}], {})]) as mock_get:
+            list(stream.get_records())
+        self.assertNotIn("order_by", mock_get.call_args[0][1])
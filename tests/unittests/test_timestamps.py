@@ -0,0 +1,69 @@
+import unittest
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+from dateutil import parser
+from singer.transform import string_to_datetime
+
+from tap_gitlab import timestamps
+from tap_gitlab.timestamps import parse_utc, to_singer_datetime
+
+SAMPLES = [
+    "2021-03-04T05:06:07.123Z",
+    "2021-03-04T05:06:07.123456Z",
+    "2021-03-04T05:06:07Z",
+    "2021-03-04T05:06:07.123+02:00",
+    "2021-03-04T05:06:07-05:30",
+    "2021-03-04T05:06:07",
+    "2021-03-04",
+    "2021-03-04 05:06:07 UTC",
+    "March 4 2021",
+]
+
+
+class TestParseUtc(unittest.TestCase):
+
+    def setUp(self):
+        parse_utc.cache_clear()
+
+    def test_matches_dateutil(self):
+        for value in SAMPLES:
+            with self.subTest(value=value):
+                expected = parser.parse(value)
+                if expected.tzinfo is None:
+                    expected = expected.replace(tzinfo=timezone.utc)
+                result = parse_utc(value)
+                self.assertEqual(result, expected)
+                self.assertEqual(result.tzinfo, timezone.utc)
+
+    def test_gitlab_format_skips_dateutil(self):
+        with patch.object(timestamps.parser, "parse") as mock_parse:
+            self.assertEqual(
+                parse_utc("2021-03-04T05:06:07.123Z"),
+                datetime(2021, 3, 4, 5, 6, 7, 123000, tzinfo=timezone.utc),
+            )
+        mock_parse.assert_not_called()
+
+    def test_odd_inputs_fall_back_to_dateutil(self):
+        with patch.object(timestamps.parser, "parse", wraps=parser.parse) as mock_parse:
+            parse_utc("2021-03-04T05:06:07.1Z")
+            parse_utc("2021-03-04 05:06:07 UTC")
+        self.assertEqual(mock_parse.call_count, 2)
+
+    def test_invalid_value_raises(self):
+        for value in ("not a date", "2021-02-30T05:06:07Z"):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                parse_utc(value)
+
+    def test_repeated_values_are_cached(self):
+        parse_utc("2021-03-04T05:06:07.123Z")
+        parse_utc("2021-03-04T05:06:07.123Z")
+        self.assertEqual(parse_utc.cache_info().hits, 1)
+
+
+class TestToSingerDatetime(unittest.TestCase):
+
+    def test_matches_singer(self):
+        for value in SAMPLES + ["not a date", "2021-02-30T05:06:07Z", 1614834367, None]:
+            with self.subTest(value=value):
+                self.assertEqual(to_singer_datetime(value), string_to_datetime(value))
@@ -0,0 +1,150 @@
+import copy
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from singer import Transformer, metadata
+from singer.transform import SchemaMismatch
+
+from helpers import get_stream
+from tap_gitlab.discover import discover
+from tap_gitlab.streams import STREAMS
+from tap_gitlab.transform import compile_schema, compile_transform
+
+PROJECT = {
+    "id": "42",
+    "name": "tap",
+    "description": None,
+    "created_at": "2021-03-04T05:06:07.123+02:00",
+    "last_activity_at": "2021-03-04",
+    "archived": "false",
+    "star_count": "1,024",
+    "tag_list": ["a", 1],
+    "topics": None,
+    "namespace": {"id": 3, "name": "group", "unknown": True},
+    "statistics": {"commit_count": "12", "repository_size": 10.0},
+    "not_in_schema": "dropped",
+}
+
+ISSUE = {
+    "id": 1,
+    "project_id": 42,
+    "title": "bug",
+    "labels": ["x", "y"],
+    "assignees": [{"id": 5, "username": "u", "extra": 1}],
+    "updated_at": "2021-01-01T00:00:00Z",
+    "closed_at": "",
+    "time_stats": {"time_estimate": "0", "total_time_spent": 1.5},
+}
+
+
+class TestCompiledTransform(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = discover()
+
+    def assert_matches_singer(self, stream_name, record, deselected=()):
+        catalog_entry = self.catalog.get_stream(stream_name)
+        schema = catalog_entry.schema.to_dict()
+        mdata = metadata.to_map(catalog_entry.metadata)
+        for field in deselected:
+            mdata = metadata.write(mdata, ("properties", field), "selected", False)
+
+        success, compiled = compile_transform(schema, mdata)(copy.deepcopy(record))
+        expected = Transformer().transform(copy.deepcopy(record), schema, mdata)
+        self.assertTrue(success)
+        self.assertEqual(compiled, expected)
+
+    def test_matches_singer_for_projects(self):
+        self.assert_matches_singer("projects", PROJECT)
+
+    def test_matches_singer_for_issues(self):
+        self.assert_matches_singer("issues", ISSUE)
+
+    def test_deselected_fields_are_dropped(self):
+        self.assert_matches_singer("projects", PROJECT, deselected=["description", "namespace"])
+
+    def test_every_stream_accepts_empty_and_null_records(self):
+        for catalog_entry in self.catalog.streams:
+            with self.subTest(stream=catalog_entry.tap_stream_id):
+                self.assert_matches_singer(catalog_entry.tap_stream_id, {})
+                self.assert_matches_singer(catalog_entry.tap_stream_id, {"id": None})
+
+    def test_type_mismatch_is_reported(self):
+        schema = self.catalog.get_stream("issues").schema.to_dict()
+        record = dict(ISSUE, id="not a number")
+        success, _ = compile_transform(schema, {})(record)
+        self.assertFalse(success)
+        with self.assertRaises(SchemaMismatch):
+            Transformer().transform(record, schema, {})
+
+    def test_scalar_types(self):
+        cases = [
+            ({"type": ["null", "boolean"]}, "False", False),
+            ({"type": ["null", "boolean"]}, "", False),
+            ({"type": ["null", "number"]}, "1,5", 15.0),
+            ({"type": ["null", "string"], "format": "singer.decimal"}, Decimal("1.10"), "1.10"),
+            ({"type": ["integer", "string"]}, "abc", "abc"),
+            ({"anyOf": [{"type": "integer"}, {"type": "null"}]}, None, None),
+        ]
+        for schema, value, expected in cases:
+            with self.subTest(schema=schema, value=value):
+                self.assertEqual(compile_schema(schema)(value), (True, expected))
+                self.assertEqual(Transformer().transform_recur(value, copy.deepcopy(schema), []), (True, expected))
+
+    def test_nested_selection_is_not_compiled(self):
+        mdata = {("properties", "namespace", "properties", "name"): {"selected": False}}
+        self.assertIsNone(compile_transform({"type": "object"}, mdata))
+
+
+class TestStreamTransform(unittest.TestCase):
+
+    def setUp(self):
+        catalog_entry = discover().get_stream("issues")
+        self.stream = STREAMS["issues"](None, catalog_entry)
+
+    def test_compiled_transform_is_used_after_the_first_record(self):
+        with Transformer() as transformer, \
+                patch.object(transformer, "transform", wraps=transformer.transform) as singer_transform:
+            first = self.stream.transform_record(copy.deepcopy(ISSUE), transformer)
+            second = self.stream.transform_record(copy.deepcopy(ISSUE), transformer)
+
+        self.assertEqual(first, second)
+        self.assertEqual(singer_transform.call_count, 1)
+
+    def test_differing_output_falls_back_to_singer(self):
+        self.stream.compiled_transform = lambda record: (True, {"id": "wrong"})
+        with Transformer() as transformer, self.assertLogs(level="WARNING"):
+            transformed = self.stream.transform_record(copy.deepcopy(ISSUE), transformer)
+
+        self.assertEqual(transformed["id"], 1)
+        self.assertTrue(self.stream.transform_mismatch.is_set())
+
+
+class TestPruneRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.catalog = discover()
+
+    def get_stream(self, stream_name, selected=True, deselected=()):
+        return get_stream(None, self.catalog, stream_name, selected, deselected)
+
+    def test_unselected_and_unknown_fields_are_dropped(self):
+        stream = self.get_stream("projects", deselected=["description", "permissions"])
+        pruned = stream.prune_record(dict(PROJECT, permissions={"project_access": None}))
+        self.assertNotIn("description", pruned)
+        self.assertNotIn("permissions", pruned)
+        self.assertNotIn("not_in_schema", pruned)
+        self.assertEqual(pruned["namespace"], PROJECT["namespace"])
+
+    def test_parent_only_streams_keep_the_fields_the_tap_reads(self):
+        stream = self.get_stream("projects", selected=False)
+        self.assertEqual(
+            set(stream.prune_record(dict(PROJECT, updated_at="2021-01-01T00:00:00Z"))),
+            {"id", "archived", "last_activity_at", "updated_at", "statistics"},
+        )
+
+    def test_internal_fields_survive_deselection(self):
+        stream = self.get_stream("branches", deselected=["commit", "merged"])
+        record = {"name": "main", "commit": {"id": "abc"}, "merged": False, "web_url": "https://"}
+        self.assertEqual(stream.prune_record(record), record)